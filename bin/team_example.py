@@ -27,6 +27,7 @@ if __name__ == '__main__':
     parser.add_argument('--scenario_args.ai', default='basic', help='')
     parser.add_argument('--scenario_args.ai_config', default={}, help='')
     parser.add_argument('--scenario_args.attack_range_only', default=False, help='')
+    parser.add_argument('--scenario_args.spatial_index', default='kd_tree', help='kd_tree, grid or brute_force')
 
     parser.add_argument('--viewer_args.fps', default=60, help='')
     parser.add_argument('--viewer_args.headless', default=False, help='')
@@ -2,6 +2,7 @@ import numpy as np
 
 from maenv.core import World, Action, Agent
 from maenv.interfaces.ai import ScriptedAI
+from maenv.utils.batch_ops import find_occupants
 
 
 class BasicScriptedAI(ScriptedAI):
@@ -15,13 +16,12 @@ class BasicScriptedAI(ScriptedAI):
         @param world:
         @return: action
         """
-        action = Action()
-        action.u = np.zeros(world.dim_p + 1)  # reset previous action
+        action = agent.action  # written in place
+        action.u[:] = 0  # reset previous action
         action.u[2] = -1  # default is no target == -1
 
         self.masked_distances = self._get_masked_distances(agent, world)
         if np.all(np.isinf(self.masked_distances)):
-            agent.action = action
             return action  # distances undefined -> no-op
         target_id = self._get_target(world)
         closest_agent = world.agents[target_id]
@@ -46,9 +46,57 @@ class BasicScriptedAI(ScriptedAI):
                 else:
                     move = world.moves[np.random.choice(move_ids)]
                     action.u[:2] = move
-        agent.action = action
         return action
 
+    def act_batch(self, world: World):
+        """
+        Vectorized act() for all alive scripted agents at once. Actions are written into world.actions.
+        @param world:
+        @return:
+        """
+        alive = world.alive.astype(bool)
+        ids = np.flatnonzero(world.scripted & alive)
+        if len(ids) == 0:
+            return
+        rows = np.arange(len(ids))
+        actions = world.actions
+        actions[ids] = 0  # reset previous action
+        actions[ids, 2] = -1  # default is no target == -1
+
+        masked_distances = self._get_masked_distances_batch(ids, world)
+        targets = self._get_targets(world, masked_distances)
+        distances = masked_distances[rows, targets]
+        has_target = ~np.all(np.isinf(masked_distances), axis=1)  # distances undefined -> no-op
+        in_range = has_target & (distances <= world.scripted_sight_ranges[ids])  # set closest agent as target if in range
+        actions[ids[in_range], 2] = targets[in_range]
+
+        # move towards the closest agent if not in range
+        chasing = ids[has_target & ~in_range]
+        if len(chasing) == 0:
+            return
+        chasing_rows = np.arange(len(chasing))
+        position_difference = world.positions[targets[has_target & ~in_range]] - world.positions[chasing]
+        max_difference_dimension = np.argmax(np.abs(position_difference), axis=1)
+        moves = np.zeros((len(chasing), world.dim_p))
+        moves[chasing_rows, max_difference_dimension] = np.sign(
+            position_difference[chasing_rows, max_difference_dimension]) * world.grid_size
+        new_positions = world.positions[chasing] + moves
+        occupied = find_occupants(world.positions[np.newaxis], new_positions[np.newaxis], mask=alive[np.newaxis])[0] >= 0
+        if np.any(occupied):  # if the stepped pos is occupied -> move to random free pos
+            stepable_positions = world.positions[chasing[occupied], np.newaxis] + world.moves
+            free = find_occupants(world.positions[np.newaxis], stepable_positions.reshape(1, -1, world.dim_p),
+                                  mask=alive[np.newaxis]).reshape(stepable_positions.shape[:2]) < 0
+            free_n = np.sum(free, axis=1)
+            random_moves = np.zeros((len(free), world.dim_p))  # No free positions to move to for these agents
+            can_move = free_n > 0
+            # Draw the n-th free move per agent (in agent order, equal to np.random.choice per agent)
+            draws = np.random.randint(0, free_n[can_move])
+            nth_free = np.cumsum(free[can_move], axis=1) - 1
+            move_ids = np.argmax(free[can_move] & (nth_free == draws[:, np.newaxis]), axis=1)
+            random_moves[can_move] = world.moves[move_ids]
+            moves[occupied] = random_moves
+        actions[chasing, :world.dim_p] = moves
+
     def _get_target(self, world) -> int:
         """
         Get closest agent id as target
@@ -59,6 +107,30 @@ class BasicScriptedAI(ScriptedAI):
         target_id = np.argmin(self.masked_distances)
         return target_id
 
+    def _get_targets(self, world: World, masked_distances: np.ndarray) -> np.ndarray:
+        """
+        Batched variant of _get_target()
+        @param world:
+        @param masked_distances: (n_scripted, n_agents) masked distances
+        @return: target id per row
+        """
+        return np.argmin(masked_distances, axis=1)
+
+    def _get_masked_distances_batch(self, ids: np.ndarray, world: World) -> np.array:
+        """
+        Batched variant of _get_masked_distances()
+        @param ids: ids of the acting agents
+        @param world:
+        @return: (len(ids), n_agents) masked distances
+        """
+        masked_distances = world.distances[ids]  # copy
+        mates = world.team_affiliations[ids, np.newaxis] == world.team_affiliations
+        # healers mask out all enemies, others all team mates. Both mask out the dead
+        non_target_mask = np.where(world.healers[ids, np.newaxis], ~mates, mates) | (world.alive == 0)
+        non_target_mask[np.arange(len(ids)), ids] = True  # infinite distance to self to prevent to be chosen as target
+        masked_distances[non_target_mask] = np.inf
+        return masked_distances
+
     def _get_masked_distances(self, agent: Agent, world: World) -> np.array:
         """
         Mask distances depending on the agent role. Healers should only target team mates which alive while attacking
@@ -11,8 +11,11 @@ class FocusScriptedAI(BasicScriptedAI):
         @param focuses: List of Roles ordered by importance of focus
         """
         super().__init__()
-        self.focuses = [int(role) for role in config["focuses"]] if config is not None else RoleTypes
-        self.target_role_mask = None
+        focuses = config["focuses"] if config is not None else RoleTypes
+        self.focuses = [int(role) for role in focuses]
+        # Rank of each role id in the focuses. Roles without focus are ranked last.
+        self.focus_ranks = np.full((max(int(role) for role in RoleTypes) + 1,), len(self.focuses), dtype=int)
+        self.focus_ranks[self.focuses[::-1]] = np.arange(len(self.focuses))[::-1]
 
     def _get_target(self, world: World) -> int:
         """
@@ -22,16 +25,17 @@ class FocusScriptedAI(BasicScriptedAI):
         @param world:
         @return: id of the target
         """
-        if self.target_role_mask is None:  # init role mask on first run
-            self.target_role_mask = np.array([int(agent.role_type) for agent in world.agents])
-        focus_masked_distances = self.masked_distances.copy()
-        for focus in self.focuses:  # search for each focus until the closest possible target is found
-            no_focus_mask = self.target_role_mask != focus
-            focus_masked_distances[no_focus_mask] = np.inf  # mask out agents not in focus because of their role
-            no_focus_target = np.all(np.isinf(focus_masked_distances))
-            if no_focus_target:
-                continue # search in next focus
-            else:
-                return np.argmin(focus_masked_distances)
+        return self._get_targets(world, self.masked_distances[np.newaxis])[0]
 
-        return np.argmin(self.masked_distances)  # no target is of the desired focus role -> fallback: just attack closest
+    def _get_targets(self, world: World, masked_distances: np.ndarray) -> np.ndarray:
+        """
+        Select the targets lexicographically by focus rank and then by distance. If no target is of a desired focus role
+        the closest target is selected.
+        @param world:
+        @param masked_distances: (n_scripted, n_agents) masked distances
+        @return: target id per row
+        """
+        targetable = ~np.isinf(masked_distances)
+        ranks = np.where(targetable, self.focus_ranks[world.roles], len(self.focuses) + 1)
+        best_rank = np.min(ranks, axis=-1, keepdims=True)
+        return np.argmin(np.where(ranks == best_rank, masked_distances, np.inf), axis=-1)
@@ -0,0 +1,168 @@
+import numpy as np
+
+from maenv.core import World, STATS_FIELDS, UNIT_TYPE_BITS
+from maenv.exceptions.agent_exceptions import IllegalTargetError
+from maenv.utils.batch_ops import pairwise_distances, range_mask, find_occupants, resolve_combat, resolve_movement
+from maenv.utils.unit_type_bit_encoder import UNKNOWN_TYPE
+
+
+class BatchedWorld(object):
+    def __init__(self, world: World, batch_size: int, seed=None):
+        """
+        Struct-of-arrays engine stepping a batch of independent worlds at once with vectorized operations.
+        All worlds share the agents, teams and static data (ranges, max health, unit types, target masks) of the
+        provided template world. Dynamic data holds a leading batch axis: (batch_size, n_agents, ...).
+
+        The batched world does not control scripted agents. Actions for ALL agents are provided to step().
+        @param world: template world which was already populated by a scenario
+        @param batch_size: number of independent worlds
+        @param seed: seed of the random ranks deciding the processing order of combat and movement
+        """
+        self.world = world
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+
+        n = world.agents_n
+        self.agents_n = n
+        self.teams_n = world.teams_n
+        self.dim_p = world.dim_p
+        self.grid_size = world.grid_size
+        self.bounds = world.bounds
+        self.moves = world.moves
+        self.obs_dims = world.obs_dims
+
+        # Static data shared by all worlds in the batch
+        self.team_affiliations = world.team_affiliations.copy()
+        self.team_masks = np.array([self.team_affiliations == team.tid for team in world.teams], dtype=bool)
+        self.max_health = world.max_health.astype(float)
+        self.sight_ranges = world.sight_ranges.copy()
+        self.attack_ranges = world.attack_ranges.copy()
+        self.unit_bits_obs = world.unit_bits_obs.copy()
+        self.unknown_unit_bits = np.array(UNIT_TYPE_BITS[UNKNOWN_TYPE], dtype=float)
+        self.target_mask = world.self_target_mask & (world.attack_target_mask | world.heal_target_mask)
+        self.has_heal = np.array([agent.has_heal() for agent in world.agents], dtype=bool)
+        self.attack_damage = world.attack_damages.copy()
+
+        # Dynamic data per world in the batch
+        self.positions = np.zeros((batch_size, n, self.dim_p))
+        self.health = np.zeros((batch_size, n))
+        self.alive = np.zeros((batch_size, n), dtype=bool)
+        self.actions = np.zeros((batch_size, n, self.dim_p + 1))
+        self.actions[..., 2] = -1  # no target
+        self.stats = np.zeros((batch_size, n, len(STATS_FIELDS)))
+        self.distances = np.zeros((batch_size, n, n))
+        self.visibility = np.zeros((batch_size, n, n), dtype=bool)
+        self.reachability = np.zeros((batch_size, n, n), dtype=bool)
+        self.obs = np.zeros((batch_size, n, n, self.obs_dims))
+        self.avail_movement_actions = np.zeros((batch_size, n, world.get_movement_dims))
+        self.avail_target_actions = np.zeros((batch_size, n, n), dtype=bool)
+        self.wiped_teams = np.zeros((batch_size, self.teams_n), dtype=bool)
+
+    def load(self, index: int, world: World):
+        """
+        Copy the dynamic state of a world into the batch. Call init() after all worlds have been loaded.
+        @param index: position in the batch
+        @param world: world built from the same scenario as the template world
+        @return:
+        """
+        self.positions[index] = world.positions
+        self.health[index] = world.health
+        self.alive[index] = world.health > 0
+        self.actions[index] = 0
+        self.actions[index, :, 2] = -1
+        self.stats[index] = world.stats
+
+    def stat(self, field: str) -> np.ndarray:
+        """
+        @param field: name of the statistic as listed in STATS_FIELDS
+        @return: (batch_size, n_agents) view on the statistic
+        """
+        return self.stats[..., STATS_FIELDS.index(field)]
+
+    def init(self):
+        """
+        Calculate all derived quantities of all worlds after a state transition.
+        """
+        pairwise_distances(self.positions, out=self.distances)
+        range_mask(self.distances, self.sight_ranges, self.alive, out=self.visibility)
+        range_mask(self.distances, self.attack_ranges, self.alive, out=self.reachability)
+        self._calculate_obs()
+        self.calculate_avail_movements_actions()
+        self.calculate_avail_target_actions()
+        self._calculate_wiped_teams()
+
+    def step(self, actions: np.ndarray = None, combat_ranks: np.ndarray = None, movement_ranks: np.ndarray = None):
+        """
+        Advance all worlds by one step. Mirrors World.step() with the random processing order of combat and movement
+        drawn as one rank per agent.
+        @param actions: (batch_size, n_agents, 3) physical actions - movement in world units and target id or -1
+        @param combat_ranks: optional (batch_size, n_agents) processing order of attacks and heals
+        @param movement_ranks: optional (batch_size, n_agents) processing order of movements
+        @return:
+        """
+        if actions is not None:
+            self.actions[...] = actions
+        if combat_ranks is None:
+            combat_ranks = self.rng.random(self.alive.shape)
+        if movement_ranks is None:
+            movement_ranks = self.rng.random(self.alive.shape)
+
+        targets = self.actions[..., 2].astype(int)
+        acting = self.health > 0
+        self._check_targets(targets, acting)
+        resolve_combat(self.health, self.max_health, targets, acting, combat_ranks,
+                       self.team_affiliations, self.has_heal, self.attack_damage, self.reachability,
+                       self.stat("dmg_dealt"), self.stat("dmg_received"), self.stat("dmg_healed"), self.stat("kills"))
+
+        # Update alive status BEFORE moving the agents
+        np.greater(self.health, 0, out=self.alive)
+
+        resolve_movement(self.positions, self.actions[..., :self.dim_p], self.alive, movement_ranks, self.alive)
+
+        self.init()
+
+    def _check_targets(self, targets: np.ndarray, acting: np.ndarray):
+        """
+        Attackers can not target their team mates. This indicates a bug.
+        """
+        friendly = self.team_affiliations[np.maximum(targets, 0)] == self.team_affiliations
+        illegal = acting & (targets >= 0) & ~self.has_heal & friendly
+        if np.any(illegal):
+            index, agent_id = np.argwhere(illegal)[0]
+            agent = self.world.agents[agent_id]
+            agent.target_id = targets[index, agent_id]
+            raise IllegalTargetError(agent)
+
+    def _calculate_obs(self):
+        not_visible_mask = ~self.visibility
+        ranges = self.sight_ranges[:, np.newaxis]
+        p = self.dim_p
+
+        self.obs[..., 0] = self.visibility
+        # Health is taken from the observing agent (equal to World._calculate_obs)
+        self.obs[..., 1] = (self.health / self.max_health)[..., np.newaxis]
+        self.obs[..., 2:2 + p] = self.positions[..., np.newaxis, :, :] - self.positions[..., :, np.newaxis, :]
+        self.obs[..., 2:2 + p] /= ranges[..., np.newaxis]
+        np.divide(self.distances, ranges, out=self.obs[..., 2 + p])
+        self.obs[..., 3 + p:] = self.unit_bits_obs
+
+        self.obs[not_visible_mask] = 0.0
+        self.obs[..., 3 + p:][not_visible_mask] = self.unknown_unit_bits
+
+    def calculate_avail_movements_actions(self):
+        if self.bounds is None:  # unbounded map -> always add all movement directions
+            self.avail_movement_actions[...] = 1.0
+            return
+        stepable_positions = self.positions[..., np.newaxis, :] + self.moves
+        queries = stepable_positions.reshape(self.batch_size, -1, self.dim_p)
+        occupied = find_occupants(self.positions, queries).reshape(stepable_positions.shape[:-1]) >= 0
+        all_in_bound = np.all((stepable_positions >= 0) & (stepable_positions <= self.bounds), axis=-1)
+        self.avail_movement_actions[...] = ~occupied & all_in_bound
+
+    def calculate_avail_target_actions(self):
+        np.logical_and(self.reachability, self.alive[..., np.newaxis], out=self.avail_target_actions)
+        self.avail_target_actions &= self.target_mask
+
+    def _calculate_wiped_teams(self):
+        alive_members = self.alive[:, np.newaxis, :] & self.team_masks
+        np.logical_not(np.any(alive_members, axis=-1), out=self.wiped_teams)
@@ -0,0 +1,75 @@
+"""
+Benchmark of the spatial index backends. Simulates a battle in which only a fraction of the agents moves per step,
+updates each index and answers the neighbourhood query of World.init().
+
+python -m maenv.benchmarks.spatial_index --agents 1000 --moving 0.1
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from maenv.spatial import REGISTRY
+
+
+def benchmark(backend: str, agents_n: int, steps: int, moving: float, grid_size: int, radius: float,
+              seed: int = 0) -> dict:
+    """
+    @param backend: key of the spatial index registry
+    @param agents_n: number of agents
+    @param steps: number of simulated steps
+    @param moving: fraction of agents moving one grid cell per step
+    @param grid_size: edge length of a grid cell
+    @param radius: radius of the range query
+    @param seed:
+    @return: mean seconds per step spent updating and querying
+    """
+    rng = np.random.default_rng(seed)
+    edge = int(np.ceil(np.sqrt(agents_n))) * 2
+    positions = rng.integers(0, edge, size=(agents_n, 2)).astype(float) * grid_size
+    moves = np.array([[0, 1], [0, -1], [1, 0], [-1, 0]]) * grid_size
+
+    index = REGISTRY[backend]()
+    start = time.perf_counter()
+    index.build(positions)
+    build = time.perf_counter() - start
+
+    update, query, pairs = 0.0, 0.0, 0
+    for _ in range(steps):
+        moved = np.flatnonzero(rng.random(agents_n) < moving)
+        positions[moved] += moves[rng.integers(len(moves), size=len(moved))]
+        start = time.perf_counter()
+        index.update(positions, moved)
+        update += time.perf_counter() - start
+        start = time.perf_counter()
+        pairs += len(index.query_pairs(radius))
+        query += time.perf_counter() - start
+
+    return {
+        "backend": backend,
+        "agents": agents_n,
+        "build": build,
+        "update": update / steps,
+        "query": query / steps,
+        "step": (update + query) / steps,
+        "pairs": pairs / steps,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backends', nargs='+', default=list(REGISTRY.keys()), choices=list(REGISTRY.keys()))
+    parser.add_argument('--agents', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--steps', type=int, default=100)
+    parser.add_argument('--moving', type=float, default=0.1, help='Fraction of agents moving per step.')
+    parser.add_argument('--grid_size', type=int, default=10)
+    parser.add_argument('--radius', type=float, default=30.0, help='Max. sight or attack range.')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    results = [
+        benchmark(backend, agents_n, args.steps, args.moving, args.grid_size, args.radius, seed=args.seed)
+        for agents_n in args.agents for backend in args.backends
+    ]
+    print(json.dumps(results, indent=2))
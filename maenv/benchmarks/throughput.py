@@ -0,0 +1,155 @@
+"""
+Benchmark of the World and MAEnv throughput across team sizes. Runs headless TeamsScenario matches and reports
+steps/sec, resets/sec, the mean latency per step phase and the peak memory as JSON.
+
+Modes:
+- random: a policy team acting random available actions through the TeamsEnv against a scripted team
+- scripted: two scripted teams stepping the World directly
+
+python -m maenv.benchmarks.throughput --team_sizes 3 10 100 --modes random scripted > results.json
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+import numpy as np
+
+from maenv.core import RoleTypes, UnitAttackTypes
+from maenv.environment import TeamsEnv
+from maenv.scenarios import TeamsScenario
+from maenv.spatial import REGISTRY
+
+MODES = ["random", "scripted"]
+
+
+def make_plan(team_size: int, scripted: bool) -> list:
+    """
+    Build plan of two equally sized teams cycling through all roles and attack types.
+    @param team_size: units per team
+    @param scripted: if the first team is scripted as well
+    @return:
+    """
+    roles = [RoleTypes.TANK, RoleTypes.ADC, RoleTypes.HEALER]
+    attack_types = [UnitAttackTypes.RANGED, UnitAttackTypes.MELEE]
+    units = [
+        {"role": roles[index % len(roles)], "attack_type": attack_types[index % len(attack_types)]}
+        for index in range(team_size)
+    ]
+    return [
+        {"is_scripted": scripted, "units": [dict(unit) for unit in units]},
+        {"is_scripted": True, "units": [dict(unit) for unit in units]},
+    ]
+
+
+def random_actions(avail_actions: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    @param avail_actions: (n, n_actions) mask of available actions
+    @param rng:
+    @return: (n,) one uniformly drawn available action per agent
+    """
+    return np.argmax(rng.random(avail_actions.shape) * avail_actions, axis=-1)
+
+
+def benchmark(team_size: int, mode: str, steps: int, resets: int, spatial_index: str = "kd_tree",
+              vectorized: bool = False, seed: int = 0, memory: bool = True) -> dict:
+    """
+    @param team_size: units per team
+    @param mode: random or scripted
+    @param steps: number of timed steps
+    @param resets: number of timed resets
+    @param spatial_index: key of the spatial index registry
+    @param vectorized: use the vectorized combat and movement resolution
+    @param seed:
+    @param memory: measure the peak memory in an additional run
+    @return: results of the configuration
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
+    plan = make_plan(team_size, scripted=mode == "scripted")
+    kwargs = dict(random_spawns=True, spatial_index=spatial_index, vectorized=vectorized, profile=True)
+    if mode == "scripted":
+        env = None
+        scenario = TeamsScenario(plan, **kwargs)
+        world = scenario.make_teams_world()
+
+        def reset():
+            scenario.reset_world(world)
+    else:
+        env = TeamsEnv(match_build_plan=plan, headless=True, array_api=True, **kwargs)
+        world = env.world
+        reset = env.reset
+
+    start = time.perf_counter()
+    for _ in range(resets):
+        reset()
+    reset_time = time.perf_counter() - start
+
+    world.profiler.reset()  # Only time the phases of steps
+
+    def step():
+        if mode == "scripted":
+            world.step()
+            return np.any(world.wiped_teams)
+        _, _, done_n, _ = env.step(random_actions(env.get_avail_actions(), rng))
+        return np.any(done_n)
+
+    episodes = 0
+    step_time = 0.0
+    for _ in range(steps):
+        start = time.perf_counter()
+        done = step()
+        step_time += time.perf_counter() - start
+        if done:
+            episodes += 1
+            reset()
+
+    phases = world.profile_stats()
+
+    peak_memory = None
+    if memory:  # Separate run since tracing distorts the timings
+        tracemalloc.start()
+        reset()
+        for _ in range(min(steps, 20)):
+            if step():
+                reset()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    if env is not None:
+        env.close()
+    return {
+        "team_size": team_size,
+        "agents": world.agents_n,
+        "mode": mode,
+        "spatial_index": spatial_index,
+        "vectorized": vectorized,
+        "steps": steps,
+        "episodes": episodes,
+        "steps_per_sec": steps / step_time,
+        "resets_per_sec": resets / reset_time if resets else None,
+        "phases_ms": {name: stats["mean_ns"] / 1e6 for name, stats in phases.items()},
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--team_sizes', type=int, nargs='+', default=[3, 10, 30, 100])
+    parser.add_argument('--modes', nargs='+', default=MODES, choices=MODES)
+    parser.add_argument('--steps', type=int, default=200)
+    parser.add_argument('--resets', type=int, default=20)
+    parser.add_argument('--spatial_index', default="kd_tree", choices=list(REGISTRY.keys()))
+    parser.add_argument('--vectorized', action='store_true', help='Use the vectorized combat and movement.')
+    parser.add_argument('--no_memory', action='store_true', help='Skip the peak memory measurement.')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    results = [
+        benchmark(team_size, mode, args.steps, args.resets, spatial_index=args.spatial_index,
+                  vectorized=args.vectorized, seed=args.seed, memory=not args.no_memory)
+        for team_size in args.team_sizes for mode in args.modes
+    ]
+    print(json.dumps(results, indent=2))
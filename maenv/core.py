@@ -5,11 +5,14 @@ import math
 from enum import Enum, IntEnum
 
 import numpy as np
-import scipy.spatial.ckdtree
-import scipy.spatial.distance
 import random
 
 from maenv.exceptions.agent_exceptions import NoTargetFoundError, IllegalTargetError
+from maenv.spatial import REGISTRY as spatial_REGISTRY
+from maenv.utils.batch_ops import find_occupants, group_positions, pairwise_distances, resolve_combat, \
+    resolve_movement
+from maenv.utils.occupancy_index import OccupancyIndex
+from maenv.utils.profiler import PhaseProfiler
 from maenv.utils.spawn_generator import SpawnGenerator
 from maenv.utils.unit_type_bit_encoder import unit_type_bits, bits_needed, UNKNOWN_TYPE
 
@@ -44,6 +47,8 @@ class ActionTypes(IntEnum):
 
 
 class EntityState(object):
+    __slots__ = ("pos", "max_health", "max_shield", "_health", "shield")
+
     def __init__(self):
         self.pos = None
         self.max_health = 0
@@ -68,6 +73,8 @@ class EntityState(object):
 
 # state of agents (including communication and internal/mental state)
 class AgentState(EntityState):
+    __slots__ = ("c",)
+
     def __init__(self):
         super(AgentState, self).__init__()
         # communication utterance
@@ -79,16 +86,45 @@ class AgentState(EntityState):
 
 
 class Action(object):
+    __slots__ = ("index", "owner", "target", "c", "_u", "_bound")
+
     def __init__(self, index=None, owner=None, target=None, u=None, c=None):
         self.index = index  # index associated with the action
         self.owner = owner  # id of agent who deployed action
         self.target = target  # target of the action
-        self.u = u  # physical action
+        self._u = u  # physical action
+        self._bound = False
         self.c = c  # communication action
 
+    @property
+    def u(self):
+        return self._u
+
+    @u.setter
+    def u(self, u):
+        # Once connected to a world the physical action is a view on the world`s actions array and written in place
+        if self._bound:
+            self._u[:] = u
+        else:
+            self._u = u
+
+    def bind(self, data: np.ndarray):
+        """
+        Move the physical action into the given storage f.e. a row of the world`s actions array.
+        @param data: (dim_p + 1,) array
+        @return:
+        """
+        if self._u is not None:
+            data[:] = self._u
+        self._u = data
+        self._bound = True
+
 
 # properties and state of physical world entity
 class Entity(object):
+    __slots__ = ("id", "target_id", "attack_range", "attack_damage", "sight_range", "bounding_circle_radius", "name",
+                 "color", "state")
+
     def __init__(self):
         self.id = None
         self.target_id = None  # agent id of the current target
@@ -111,6 +147,8 @@ class Entity(object):
 
 
 class WorldObject(Entity):
+    __slots__ = ()
+
     def __init__(self):
         super(WorldObject, self).__init__()
 
@@ -123,9 +161,21 @@ class Team:
         self.size = len(members)  # team size not influenced by deaths
 
 
+# Order of the performance statistics when stored as array
+STATS_FIELDS = ("kills", "assists", "dmg_received", "dmg_dealt", "dmg_healed", "attacks_performed", "heals_performed",
+                "distance_traveled")
+
+
 class PerformanceStatistics:
+    __slots__ = ("_data",)
+
     def __init__(self, kills=0, assists=0, dmg_dealt=0, dmg_healed=0, attacks_performed=0, heals_performed=0,
                  distance_traveled=0, dmg_received=0):
+        """
+        Statistics of an agent stored as array in the order of STATS_FIELDS. Once connected to a world the
+        statistics are a view on the world`s stats array.
+        """
+        self._data = np.zeros((len(STATS_FIELDS),))
         self.kills = kills
         self.assists = assists
         self.dmg_received = dmg_received
@@ -135,18 +185,37 @@ class PerformanceStatistics:
         self.heals_performed = heals_performed
         self.distance_traveled = distance_traveled
 
+    def bind(self, data: np.ndarray):
+        """
+        Move the statistics into the given storage f.e. a row of the world`s stats array.
+        @param data: (len(STATS_FIELDS),) array
+        @return:
+        """
+        data[:] = self._data
+        self._data = data
+
     def reset(self):
-        self.kills = 0
-        self.assists = 0
-        self.dmg_received = 0
-        self.dmg_dealt = 0
-        self.dmg_healed = 0
-        self.attacks_performed = 0
-        self.heals_performed = 0
-        self.distance_traveled = 0
+        self._data[:] = 0
+
+
+def _stats_field(index):
+    def get(self):
+        return self._data[index]
+
+    def set(self, value):
+        self._data[index] = value
+
+    return property(get, set)
+
+
+for _index, _field in enumerate(STATS_FIELDS):
+    setattr(PerformanceStatistics, _field, _stats_field(_index))
 
 
 class Agent(Entity):
+    __slots__ = ("tid", "is_scripted", "unit_id", "unit_type_bits", "unit_type_bits_n", "attack_type", "attack_data",
+                 "role_type", "role_data", "action", "stats")
+
     def __init__(self, id, tid, color, build_plan, is_scripted=False):
         super(Agent, self).__init__()
         self.id = id
@@ -217,13 +286,38 @@ class World(object):
     def __init__(self, grid_size: int, n_agents: int, n_teams: int, bounds=np.array([1280, 720]),
                  ai="basic", ai_config=None,
                  attack_range_only=True,
-                 log=False):
+                 broadcast_movement_mask=False,
+                 spatial_index="kd_tree",
+                 vectorized=False, seed=None,
+                 policy_obs_only=False, obs_k=None,
+                 dtype=np.float64, distance_update_threshold=0.25,
+                 profile=False, log=False):
         """
         Multi-agent world
         :param bounds: World bounds in which the agents can move
+        :param vectorized: Resolve all attacks, heals and movements of a step at once from the actions array instead
+        of one agent after another. The processing order is drawn as seeded permutation.
+        :param seed: Seed of the processing order in vectorized mode
+        :param spatial_index: Index answering range queries: "kd_tree", "grid" (re-buckets only moved agents) or
+        "brute_force" (for tiny worlds)
+        :param broadcast_movement_mask: Calculate occupied steps by comparing every step against every agent position
+        instead of looking up the steps in the sorted agent positions. Needs O(n^2) memory. Used for testing.
+        :param policy_obs_only: Only calculate the observations of policy agents. The obs rows of scripted agents,
+        which act on the world data directly, are not calculated.
+        :param obs_k: Observe only the k nearest visible other agents (padded to k) instead of all agents. The obs
+        buffer shrinks to (n_agents, k, obs_dims) which makes the observation size independent of the agent count.
+        :param dtype: Float type of health, positions, distances and observations f.e. np.float32
+        :param distance_update_threshold: Fraction of moved agents up to which only the distances of the moved agents
+        are updated. All distances are recalculated if more agents moved.
+        :param profile: Time each phase of step() and init(). See profile_stats(). Disabled worlds are not instrumented.
         """
         self.bounds = bounds
+        self.dtype = np.dtype(dtype)
+        self.distance_update_threshold = distance_update_threshold
         self.log = log
+        self.broadcast_movement_mask = broadcast_movement_mask
+        self.vectorized = vectorized
+        self.rng = np.random.default_rng(seed)
         from maenv.ai import REGISTRY as ai_REGISTRY
         self.scripted_ai = ai_REGISTRY[ai](ai_config)
         self.positions = None
@@ -250,12 +344,15 @@ class World(object):
         # Team affiliation (team id) for later masking
         self.team_affiliations = np.full((n_agents,), -1, dtype=int)
         # Holds each agents health and max health
-        self.health = np.zeros((n_agents,), dtype=float)
+        self.health = np.zeros((n_agents,), dtype=self.dtype)
         self.max_health = np.zeros((n_agents,), dtype=int)
         # Holds each agents action
         self.actions = np.zeros((n_agents, self.dim_p + 1))
+        self.actions[:, 2] = -1  # no target
+        # Holds each agents performance statistics in the order of STATS_FIELDS
+        self.stats = np.zeros((n_agents, len(STATS_FIELDS)))
         # Holds all available movement actions in the current step - all moves are initially allowed if spawns are correct
-        self.avail_movement_actions = np.ones((n_agents, self.get_movement_dims), dtype=float)  # 4 movement directions
+        self.avail_movement_actions = np.ones((n_agents, self.get_movement_dims), dtype=self.dtype)  # 4 movement directions
         self.moves = np.array([[-1, 0], [1, 0], [0, 1], [0, -1]]) * self.grid_size  # W/E/N/S move
 
         # Holds all available target actions in the current step - all targets are blocked in the beginning
@@ -269,30 +366,76 @@ class World(object):
 
         # Holds each agents sight range
         self.sight_ranges = np.zeros((n_agents,), dtype=float)
+        # Holds each agents sight range used by scripted AIs which is independent of attack_range_only
+        self.scripted_sight_ranges = np.zeros((n_agents,), dtype=float)
         # Holds each agents attack range
         self.attack_ranges = np.zeros((n_agents,), dtype=float)
+        # Holds each agents attack damage or heal amount
+        self.attack_damages = np.zeros((n_agents,), dtype=float)
+        # Holds if an agent heals its team mates instead of attacking enemies
+        self.healers = np.zeros((n_agents,), dtype=bool)
+        # Holds if an agent is controlled by the scripted AI
+        self.scripted = np.zeros((n_agents,), dtype=bool)
+        # Holds each agents role id
+        self.roles = np.zeros((n_agents,), dtype=int)
         # Holds each agents unit representation encoded as bit array
         self.unit_bits_obs = np.zeros((n_agents, UNIT_BITS_NEEDED), dtype=float)
-        # Holds each agents position in real and complex space
-        self.positions = np.zeros((n_agents, self.dim_p))
-        self.positions_c = np.zeros((1, n_agents), dtype=complex)
+        # Holds each agents position
+        self.positions = np.zeros((n_agents, self.dim_p), dtype=self.dtype)
         # Holds all positions an agent can step on in the current state
         self.stepable_positions = np.zeros((n_agents, self.get_movement_dims, self.dim_p))
         # Holds each agents distance to other agents (and himself on diag = always 0)
-        self.distances = np.full((n_agents, n_agents), fill_value=np.inf)
+        self.distances = np.full((n_agents, n_agents), fill_value=np.inf, dtype=self.dtype)
         # Holds each agents visibility of other agents (and himself on diag = always True)
-        self.visibility = np.zeros((n_agents, n_agents))
+        self.visibility = np.zeros((n_agents, n_agents), dtype=bool)
         # Holds each agents visibility of other agents (and himself on diag = always True)
-        self.reachability = np.zeros((n_agents, n_agents))
-        # Holds each agents observation of all other agents
-        self.obs = np.zeros((n_agents, n_agents, self.obs_dims))
+        self.reachability = np.zeros((n_agents, n_agents), dtype=bool)
+        # Holds each agents observation of all other agents or of its k nearest visible agents
+        self.obs_k = obs_k
+        observed_n = n_agents if obs_k is None else obs_k
+        self.obs = np.zeros((n_agents, observed_n, self.obs_dims), dtype=self.dtype)
+        self._not_visible = np.zeros((n_agents, observed_n), dtype=bool)
+        self.policy_obs_only = policy_obs_only
+        self._obs_rows = slice(None)  # Rows of the observing agents in the obs buffer
+        self._unknown_unit_bits = np.array(UNIT_TYPE_BITS[UNKNOWN_TYPE], dtype=float)
+
+        # Number of state transitions. Lets consumers cache data derived from the world
+        self.tick = 0
+        # Inputs of the derived data at the last init. Derived data is only recalculated if its inputs changed
+        self._init_positions = np.zeros_like(self.positions)
+        self._init_alive = np.zeros((n_agents,), dtype=bool)
+        self._init_health = np.zeros_like(self.health)
+        # Number of skipped recalculations per derived data
+        self.skipped_updates = dict.fromkeys(["neighbours", "visibility", "reachability", "distances", "obs",
+                                              "avail_movement", "avail_target", "wiped_teams"], 0)
 
         # Helper to calculate range queries
-        self.kd_tree = None
+        self.spatial_index = spatial_REGISTRY[spatial_index]()
+        self._rebuild_spatial_index = True  # Rebuild after agents were (re-)connected
+        # Sparse pairs (i, j, distance v) of agents within the largest sight or attack range of each other
+        self.neighbours = None
+
+        # Static agent data is wired once by reset_agents()
+        self._wired = False
+
+        # Helper to look up which agents occupy a position
+        self.occupancy = OccupancyIndex()
 
         # Helper to generate points within the world
         self.spg = SpawnGenerator(self.grid_center, grid_size, self.dim_p, n_agents)
 
+        # Timer of the step phases
+        self.profiler = None
+        if profile:
+            self.profiler = PhaseProfiler()
+            self.profiler.instrument(self)
+
+    def profile_stats(self) -> dict:
+        """
+        @return: timings per phase of step() and init() or an empty dict if the world is not profiled
+        """
+        return self.profiler.stats() if self.profiler is not None else {}
+
     def is_free(self, pos: np.array):
         """
         Checks is a given position is not occupied in the world and therefore free to move.
@@ -300,8 +443,7 @@ class World(object):
         @param pos:
         @return:
         """
-        pos_occupied = np.all(self.positions[self.alive == 1] == pos, axis=1)
-        return not np.any(pos_occupied)
+        return not any(self.alive[occupant] for occupant in self.occupancy.occupants(pos))
 
     def is_valid_move(self, agent_id: int):
         """
@@ -376,28 +518,78 @@ class World(object):
         return self.reachability[agent.id][target.id]
 
     def init(self):
-        # Update KDTree after positions-update
-        self.kd_tree = scipy.spatial.cKDTree(data=self.positions)
+        # Only recalculate data whose inputs changed since the last init
+        moved, movers, died, health_changed = self._detect_changes()
+
+        # Update spatial index after positions-update
+        if self._rebuild_spatial_index:
+            movers = None  # Agents were (re-)connected - recalculate all distances
+            self._update_obs_rows()
+            self.spatial_index.build(self.positions)
+            self._rebuild_spatial_index = False
+        elif moved:
+            self.spatial_index.update(self.positions, movers)
         #
         # End of state transition - Calculate observations
         #
-        self._update_visibility()  # Used for obs-calculation
+        if self._update_if("neighbours", moved):
+            self._query_neighbours()  # Single range query for visibility and reachability
+
+        if self._update_if("visibility", moved or died):
+            self._update_visibility(self.neighbours)  # Used for obs-calculation
 
-        self._update_reachability()
+        if self._update_if("reachability", moved or died):
+            self._update_reachability(self.neighbours)
 
-        self._update_dist_matrix()  # Used for obs-calculation
+        if self._update_if("distances", moved):
+            self._update_dist_matrix(movers)  # Used for obs-calculation
 
-        self._calculate_obs()  # Calculate what is observed after the step is calculated
+        if self._update_if("obs", moved or died):
+            self._calculate_obs()  # Calculate what is observed after the step is calculated
+        elif health_changed:  # Only the health observed by the agents changed
+            self._calculate_obs_health()
 
         #
         # Calculate each agents available actions after the step is calculated
         #
-        self.calculate_avail_movements_actions()
+        if self._update_if("avail_movement", moved):
+            self.calculate_avail_movements_actions()
 
-        self.calculate_avail_target_actions()
+        if self._update_if("avail_target", moved or died):
+            self.calculate_avail_target_actions()
 
         # After state transition test win condition
-        self._calculate_wiped_teams()
+        if self._update_if("wiped_teams", died):
+            self._calculate_wiped_teams()
+
+        self.tick += 1
+
+    def _detect_changes(self):
+        """
+        Compare positions, alive status and health with their state at the last init. All data is considered
+        changed after agents were (re-)connected.
+        @return: if any agent moved, ids of the agents which moved, if any agent died (or revived) and if any health
+        changed
+        """
+        changed = self._rebuild_spatial_index
+        movers = np.flatnonzero(np.any(self.positions != self._init_positions, axis=-1))
+        moved = changed or len(movers) > 0
+        died = changed or not np.array_equal(self.alive, self._init_alive)
+        health_changed = changed or not np.array_equal(self.health, self._init_health)
+        np.copyto(self._init_positions, self.positions)
+        self._init_alive[:] = self.alive
+        np.copyto(self._init_health, self.health)
+        return moved, movers, died, health_changed
+
+    def _update_if(self, name: str, dirty: bool) -> bool:
+        """
+        @param name: name of the derived data
+        @param dirty: if the inputs of the data changed
+        @return: dirty - counts the skipped update otherwise
+        """
+        if not dirty:
+            self.skipped_updates[name] += 1
+        return dirty
 
     def step(self):
         """
@@ -407,11 +599,28 @@ class World(object):
         self._calculate_stepable_pos()
 
         # Set actions for scripted/heuristic agents BEFORE advancing state
-        for scripted_agent in self.alive_scripted_agents:
-            self.scripted_ai.act(scripted_agent, self)
+        self._act_scripted()
 
-        # Shuffle randomly to prevent favoring
         # Calculate influence actions BEFORE updating positions to prevent moving out of range after action was set
+        self._resolve_combat()
+
+        # Update alive status BEFORE moving the agents
+        self._update_alive_status()
+
+        # Update positions BEFORE recalculating visibility and observations
+        self._resolve_movement()
+
+        # Re-Init
+        self.init()
+
+    def _act_scripted(self):
+        self.scripted_ai.act_batch(self)
+
+    def _resolve_combat(self):
+        if self.vectorized:
+            self._resolve_combat_vectorized()
+            return
+        # Shuffle randomly to prevent favoring
         for agent in random.sample(self.alive_agents, len(self.alive_agents)):
             # Influence entity if target set f.e with attack, heal etc
             agent_has_action_target = agent.action.u[2] != -1
@@ -431,15 +640,55 @@ class World(object):
 
                 agent.target_id = None  # Reset target after processing
 
-        # Update alive status BEFORE moving the agents
-        self._update_alive_status()
+    def _resolve_combat_vectorized(self):
+        """
+        Resolve all attacks and heals at once. The result equals the sequential resolution with the agents processed
+        in the order of a seeded permutation.
+        @return:
+        """
+        target_ids = self.actions[:, 2]
+        if np.any(np.isnan(target_ids)):
+            raise NoTargetFoundError()
+        targets = target_ids.astype(int)
+        acting = self.health > 0
+
+        # Attackers can not target their team mates. This indicates a bug.
+        friendly = self.team_affiliations[np.maximum(targets, 0)] == self.team_affiliations
+        illegal = acting & (targets != -1) & ~self.healers & friendly
+        if np.any(illegal):
+            agent = self.agents[np.flatnonzero(illegal)[0]]
+            agent.target_id = targets[agent.id]
+            raise IllegalTargetError(agent)
 
-        # Update positions BEFORE recalculating visibility and observations
+        ranks = self.rng.permutation(self.agents_n)
+        stat = STATS_FIELDS.index
+        resolve_combat(self.health[np.newaxis], self.max_health, targets[np.newaxis], acting[np.newaxis],
+                       ranks[np.newaxis], self.team_affiliations, self.healers, self.attack_damages,
+                       self.reachability[np.newaxis],
+                       self.stats[np.newaxis, :, stat("dmg_dealt")], self.stats[np.newaxis, :, stat("dmg_received")],
+                       self.stats[np.newaxis, :, stat("dmg_healed")], self.stats[np.newaxis, :, stat("kills")])
+
+    def _resolve_movement(self):
+        if self.vectorized:
+            self._resolve_movement_vectorized()
+            return
         for a in random.sample(self.alive_agents, len(self.alive_agents)):
             self._update_pos(a)
 
-        # Re-Init
-        self.init()
+    def _resolve_movement_vectorized(self):
+        """
+        Move all alive agents at once. A move is blocked if an alive agent stands on the destination at the turn of the
+        moving agent. The result equals the sequential movement with the agents processed in the order of a seeded
+        permutation.
+        @return:
+        """
+        moves = self.actions[:, :self.dim_p]  # Moves which are not allowed are reset in place
+        ranks = self.rng.permutation(self.agents_n)
+        moved = resolve_movement(self.positions[np.newaxis], moves[np.newaxis], self.alive[np.newaxis],
+                                 ranks[np.newaxis], self.alive[np.newaxis])[0]
+
+        for agent_id in np.flatnonzero(moved):
+            self.occupancy.add(agent_id, self.positions[agent_id])
 
     def _calculate_wiped_teams(self):
         self.wiped_teams = [np.all(np.logical_not(self.alive[self.team_affiliations == t.tid])) for t in self.teams]
@@ -463,63 +712,141 @@ class World(object):
             new_pos = pos + move_vector
             if self.is_free(new_pos):  # move is allowed
                 self.positions[agent.id] += move_vector
-                self.positions_c[0, agent.id] += complex(*move_vector)  # update complex position
+                self.occupancy.add(agent.id, self.positions[agent.id])
             else:  # reset action if not allowed -> important to keep state consistent for rendering
                 agent.action.u[:2] = 0.0
 
-    def _update_visibility(self):
+    def _query_neighbours(self, radius: float = None):
+        """
+        Query all pairs of agents within the largest sight or attack range once. Visibility and reachability are
+        derived from the distances of these pairs.
+        @param radius: query radius, defaults to the largest sight or attack range
+        @return:
+        """
+        if radius is None:
+            radius = max(np.max(self.sight_ranges), np.max(self.attack_ranges))
+        self.neighbours = self.spatial_index.query_pairs(radius)
+        return self.neighbours
+
+    def _in_range(self, ranges: np.array, neighbours: np.array = None):
+        """
+        @param ranges: range of each agent
+        @param neighbours: pairs of a neighbourhood query covering the ranges, queried if not provided
+        @return: matrix coordinates of all pairs (agent, other) in which other is within range of the agent
+        """
+        if neighbours is None:
+            neighbours = self._query_neighbours(np.max(ranges))
+        agents, others = neighbours['i'], neighbours['j']
+        in_range = neighbours['v'] <= ranges[agents]
+        return agents[in_range], others[in_range]
+
+    def _update_visibility(self, neighbours: np.array = None):
         self.visibility[:, :] = False  # Reset
-        query = self.kd_tree.query_ball_point(self.positions, self.sight_ranges)
-        visible = [[(agent, other, self.alive[agent]) for other in visibles] for agent, visibles in enumerate(query)]
-        visible = np.array([item for sublist in visible for item in sublist])  # flatten
-        xs, ys, alives = list(zip(*visible))  # Matrix coordinates and their corresponding value
-        self.visibility[xs, ys] = alives  # If the agent is alive set its visible indices to True else False
+        xs, ys = self._in_range(self.sight_ranges, neighbours)  # Matrix coordinates
+        self.visibility[xs, ys] = self.alive[xs]  # If the agent is alive set its visible indices to True else False
         self.visibility[:, self.alive == 0] = False  # Set the visibility of all dead agents to False
 
-    def _update_reachability(self):
+    def _update_reachability(self, neighbours: np.array = None):
         self.reachability[:, :] = False  # Reset
-        query = self.kd_tree.query_ball_point(self.positions, self.attack_ranges)
-        reachable = [[(agent, other, self.alive[agent]) for other in reachables] for agent, reachables in enumerate(query)]
-        reachable = np.array([item for sublist in reachable for item in sublist])  # flatten
-        xs, ys, alives = list(zip(*reachable))  # Matrix coordinates and their corresponding value
-        self.reachability[xs, ys] = alives  # If the agent is alive set its reachable indices to True else False
+        xs, ys = self._in_range(self.attack_ranges, neighbours)  # Matrix coordinates
+        self.reachability[xs, ys] = self.alive[xs]  # If the agent is alive set its reachable indices to True else False
         self.reachability[:, self.alive == 0] = False  # Set the reachability of all dead agents to False
 
-    def _update_dist_matrix(self):
-        self.distances = abs(self.positions_c.T - self.positions_c)  # abs in complex space is distance in real space
+    def _update_dist_matrix(self, movers: np.ndarray = None):
+        """
+        Update the distances of the moved agents only. Only their rows and columns change.
+        @param movers: ids of the agents which moved, recalculates all distances if not provided
+        @return:
+        """
+        if movers is None or len(movers) > self.distance_update_threshold * self.agents_n:
+            pairwise_distances(self.positions[np.newaxis], out=self.distances[np.newaxis])
+            return
+        differences = self.positions[np.newaxis, :] - self.positions[movers, np.newaxis]
+        distances = np.hypot(differences[..., 0], differences[..., 1])
+        self.distances[movers] = distances
+        self.distances[:, movers] = distances.T
+
+    def _update_obs_rows(self):
+        """
+        Policy agents are connected team-wise and therefore hold a contiguous id range. Only this range is observed
+        if the observations of scripted agents are not needed.
+        """
+        policy_ids = np.flatnonzero(~self.scripted)
+        if not self.policy_obs_only:
+            self._obs_rows = slice(None)
+        elif len(policy_ids) == 0:
+            self._obs_rows = slice(0, 0)
+        else:
+            self._obs_rows = slice(policy_ids[0], policy_ids[-1] + 1)
 
     def _calculate_obs(self):
-        not_visible_mask = self.visibility == 0
-
-        ranges = self.sight_ranges[:, np.newaxis]
-        range_matrix = np.repeat(ranges, self.agents_n, axis=1)[:, :, np.newaxis]
-        position_differences = (self.positions - self.positions[:, None])[..., :]
-
-        relative_positions_obs = position_differences / range_matrix
-        relative_positions_obs[not_visible_mask] = [0.0, 0.0]  # relative position to invisible agents set to 0,0
-
-        relative_distances_obs = (self.distances / ranges)[:, :, np.newaxis]
-        relative_distances_obs[not_visible_mask] = 0.0  # relative distance to invisible agents set to 0
-
-        health_obs = np.repeat(self.health[:, np.newaxis], self.agents_n, axis=1)
-        max_health = np.repeat(self.max_health[:, np.newaxis], self.agents_n, axis=1)
-        health_obs /= max_health  # Normalize by max health
-        health_obs = health_obs[:, :, np.newaxis]
-        health_obs[not_visible_mask] = 0.0  # health of invisible agents set to 0
-
-        others_unit_bits_obs = np.repeat([self.unit_bits_obs], self.agents_n, axis=0)
-        others_unit_bits_obs[not_visible_mask] = UNIT_TYPE_BITS[UNKNOWN_TYPE]  # unit-bits of invisible agents = unknown
-
-        self.obs = np.concatenate(
-            (
-                self.visibility[:, :, np.newaxis],
-                health_obs,
-                relative_positions_obs,
-                relative_distances_obs,
-                others_unit_bits_obs,
-            ),
-            axis=2
-        )
+        """
+        Write the observation of every observing agent of every other agent in place into the persistent obs buffer.
+        """
+        if self.obs_k is not None:
+            self._calculate_top_k_obs()
+            return
+        p = self.dim_p
+        rows = self._obs_rows
+        obs, visibility, not_visible = self.obs[rows], self.visibility[rows], self._not_visible[rows]
+        ranges = self.sight_ranges[rows, np.newaxis]
+        np.logical_not(visibility, out=not_visible)
+
+        np.copyto(obs[..., 0], visibility)
+        # Health is taken from the observing agent
+        np.divide(self.health[rows, np.newaxis], self.max_health[rows, np.newaxis], out=obs[..., 1])
+        relative_positions_obs = obs[..., 2:2 + p]
+        np.subtract(self.positions[np.newaxis, :], self.positions[rows, np.newaxis], out=relative_positions_obs)
+        np.divide(relative_positions_obs, ranges[..., np.newaxis], out=relative_positions_obs)
+        np.divide(self.distances[rows], ranges, out=obs[..., 2 + p])
+        obs[..., 3 + p:] = self.unit_bits_obs
+
+        # Invisible agents are observed as zeros with unknown unit type
+        np.copyto(obs, 0.0, where=not_visible[..., np.newaxis])
+        np.copyto(obs[..., 3 + p:], self._unknown_unit_bits, where=not_visible[..., np.newaxis])
+
+    def _calculate_top_k_obs(self):
+        """
+        Write the observation of the k nearest visible other agents of every observing agent into the obs buffer.
+        Candidates are taken from the neighbour pairs of the range query. Rows are ordered by distance and equal the
+        rows of the full observation. Missing rows are padded as invisible agents.
+        """
+        p = self.dim_p
+        rows = self._obs_rows
+        obs = self.obs[rows]
+        obs[...] = 0.0
+        obs[..., 3 + p:] = self._unknown_unit_bits
+        self._not_visible[rows] = True
+
+        agents, others = self.neighbours['i'], self.neighbours['j']
+        visible = (agents != others) & self.visibility[agents, others]
+        if self.policy_obs_only:
+            visible &= (agents >= rows.start) & (agents < rows.stop)
+        agents, others = agents[visible], others[visible]
+        distances = self.distances[agents, others]
+        # Sort by observing agent and distance to number the visible agents of each observer
+        order = np.lexsort((others, distances, agents))
+        agents, others, distances = agents[order], others[order], distances[order]
+        slots = group_positions(agents)
+        nearest = slots < self.obs_k
+        agents, others, distances, slots = agents[nearest], others[nearest], distances[nearest], slots[nearest]
+
+        ranges = self.sight_ranges[agents]
+        self.obs[agents, slots, 0] = 1.0
+        self.obs[agents, slots, 1] = self.health[agents] / self.max_health[agents]
+        self.obs[agents, slots, 2:2 + p] = (self.positions[others] - self.positions[agents]) / ranges[:, np.newaxis]
+        self.obs[agents, slots, 2 + p] = distances / ranges
+        self.obs[agents, slots, 3 + p:] = self.unit_bits_obs[others]
+        self._not_visible[agents, slots] = False
+
+    def _calculate_obs_health(self):
+        """
+        Update the observed health in the obs buffer. Used if only the health changed since the last init.
+        """
+        rows = self._obs_rows
+        obs_health = self.obs[rows, :, 1]
+        np.divide(self.health[rows, np.newaxis], self.max_health[rows, np.newaxis], out=obs_health)
+        np.copyto(obs_health, 0.0, where=self._not_visible[rows])
 
     def connect(self, agent, spawn=None):
         """
@@ -531,18 +858,62 @@ class World(object):
         @param spawn:
         @return:
         """
-        self.health[agent.id] = agent.state.max_health  # Set initial health
-        agent.state._health = self.health[agent.id:(agent.id + 1)]  # Connect agent health with world data storage
+        self._wire_agent(agent)
 
-        self.positions[agent.id] = spawn  # Set initial position in real and complex space
-        self.positions_c[0, agent.id] = complex(*spawn) if spawn is not None else complex()
-        agent.state.pos = self.positions[agent.id]  # Connect agent position with world data storage
+        self.health[agent.id] = agent.state.max_health  # Set initial health
+        self.positions[agent.id] = spawn  # Set initial position
+        if spawn is not None:
+            self.occupancy.add(agent.id, self.positions[agent.id])
+        else:
+            self.occupancy.remove(agent.id)
+        self._rebuild_spatial_index = True
 
         self.alive[agent.id] = agent.is_alive()  # Set initial alive status - agents assumed to be dead in the beginning
 
+    def wire(self):
+        """
+        Connect the static data of all agents once. Episodes are started via reset_agents() afterwards.
+        @return:
+        """
+        for agent in self.agents:
+            self._wire_agent(agent)
+        self._wired = True
+
+    def reset_agents(self, spawns: np.ndarray):
+        """
+        Reset health, positions, alive status and stats of all agents at once to start a new episode.
+        Wires the agents on the first call.
+        @param spawns: (n_agents, dim_p) spawn of each agent ordered by agent id
+        @return:
+        """
+        if not self._wired:
+            self.wire()
+        np.copyto(self.health, self.max_health)
+        self.positions[:] = spawns
+        self.alive = self.health > 0
+        self.stats[:] = 0
+        self.occupancy.reset(self.positions)
+        self._rebuild_spatial_index = True
+
+    def _wire_agent(self, agent):
+        """
+        Reference the agent data with the world data storage and set the static data of the agent.
+        @param agent:
+        @return:
+        """
+        agent.state._health = self.health[agent.id:(agent.id + 1)]  # Connect agent health with world data storage
+        agent.state.pos = self.positions[agent.id]  # Connect agent position with world data storage
+        agent.stats.bind(self.stats[agent.id])  # Connect agent stats with world data storage
+        agent.action.bind(self.actions[agent.id])  # Connect agent action with world data storage
+
         # Static data
         self.sight_ranges[agent.id] = (agent.attack_range if self.attack_range_only else agent.sight_range) * self.grid_size
+        self.scripted_sight_ranges[agent.id] = agent.sight_range * self.grid_size
         self.attack_ranges[agent.id] = agent.attack_range * self.grid_size
+        self.attack_damages[agent.id] = agent.attack_damage
+        self.healers[agent.id] = agent.has_heal()
+        self.scripted[agent.id] = agent.is_scripted
+        self.roles[agent.id] = int(agent.role_type)
         self.max_health[agent.id] = agent.state.max_health
         self.unit_bits_obs[agent.id] = agent.unit_type_bits
         team_mates = [mate.id for mate in self.agents if mate.tid == agent.tid]
@@ -552,7 +923,10 @@ class World(object):
         self.team_affiliations[agent.id] = agent.tid
 
     def _update_alive_status(self):
-        self.alive = self.health > 0
+        alive = self.health > 0
+        for dead in np.flatnonzero(np.logical_and(self.alive, ~alive)):  # release positions of agents which died
+            self.occupancy.remove(dead)
+        self.alive = alive
 
     def calculate_avail_movements_actions(self):
         self.avail_movement_actions[:, :] = 0  # Reset
@@ -564,10 +938,15 @@ class World(object):
             self._calculate_stepable_pos()
 
             legal_step_mask = np.ones((n, m_dims), dtype=bool)  # Marks legal moves
-            # Stepped pos for every agents pos
-            stepped_positions_n_agent = self.stepable_positions.repeat(n, axis=1).reshape(n, m_dims, n, -1)
-            # np.all = pos overlap in x and y, np.any = any step overlap with any agent pos
-            occupied_mask = np.any(np.all(stepped_positions_n_agent == self.positions, axis=3), axis=2)
+            if self.broadcast_movement_mask:
+                # Stepped pos for every agents pos
+                stepped_positions_n_agent = self.stepable_positions.repeat(n, axis=1).reshape(n, m_dims, n, -1)
+                # np.all = pos overlap in x and y, np.any = any step overlap with any agent pos
+                occupied_mask = np.any(np.all(stepped_positions_n_agent == self.positions, axis=3), axis=2)
+            else:
+                # Look up all steps in the sorted agent positions
+                steps = self.stepable_positions.reshape(1, n * m_dims, -1)
+                occupied_mask = (find_occupants(self.positions[np.newaxis], steps) >= 0).reshape(n, m_dims)
             legal_step_mask[occupied_mask] = False  # Mask contains entries which are occupied
 
             # In bounds checks
@@ -586,4 +965,4 @@ class World(object):
         self.avail_target_actions[:, :] = 0.0  # Reset
         target_mask = self.attack_target_mask | self.heal_target_mask
         alive = np.expand_dims(self.alive, axis=1)
-        self.avail_target_actions = (self.reachability == 1) & alive & self.self_target_mask & target_mask
+        self.avail_target_actions = self.reachability & alive & self.self_target_mask & target_mask
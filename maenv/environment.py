@@ -1,11 +1,17 @@
+import asyncio
 import logging
+import multiprocessing
+import random
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 import gym
 import numpy as np
 from gym import spaces
 
 from maenv.core import World, Team
-from maenv.exceptions.environment_exceptions import ActionCountMismatch
+from maenv.exceptions.environment_exceptions import ActionCountMismatch, InvalidActionId, EnvironmentWorkerError, \
+    AsyncStepError
 
 
 class MAEnv(gym.Env):
@@ -15,8 +21,9 @@ class MAEnv(gym.Env):
 
     def __init__(self, world: World,
                  reset_callback=None, reward_callback=None, observation_callback=None,
-                 info_callback=None, done_callback=None,
-                 global_reward=True,
+                 info_callback=None, done_callback=None, observations_callback=None,
+                 rewards_callback=None, dones_callback=None,
+                 global_reward=True, array_api=False,
                  log=False, log_level=logging.ERROR,
                  fps=None, infos=True, draw_grid=True,
                  record=False, headless=False, stream_key=None, seed=None, debug_range=False, debug_health=True, **kwargs):
@@ -46,6 +53,19 @@ class MAEnv(gym.Env):
             provided callback to supply agents with their observation.
             For more info see: BaseTeamScenario in maenv/scenarios/team/teams.py
 
+        @param observations_callback: func, optional
+            provided callback writing the observations of all policy agents at once into a buffer.
+            Falls back to calling the observation_callback per agent.
+            For more info see: BaseTeamScenario in maenv/scenarios/team/teams.py
+
+        @param rewards_callback: func, optional
+            provided callback to supply the given agents with their rewards at once. Used by the array api.
+            For more info see: BaseTeamScenario in maenv/scenarios/team/teams.py
+
+        @param dones_callback: func, optional
+            provided callback to return the terminal booleans of all teams at once. Used by the array api.
+            For more info see: BaseTeamScenario in maenv/scenarios/team/teams.py
+
         @param info_callback: func, optional
             provided callback to return additional data.
             For more info see: BaseTeamScenario in maenv/scenarios/team/teams.py
@@ -54,6 +74,13 @@ class MAEnv(gym.Env):
             provided callback to return terminal boolean.
             For more info see: BaseTeamScenario in maenv/scenarios/team/teams.py
 
+        @param global_reward: bool, optional
+            whether every agent of a team receives the same reward.
+
+        @param array_api: bool, optional
+            whether step(), reset() and get_obs() return stacked arrays instead of per-agent lists. Avail actions
+            are then additionally provided as (n_policy_agents, n_actions) mask in the step info.
+
         @param log: bool, optional
             whether environment internals should be logged into env.log.
             This can significantly reduce performance if set to true and is only advised to debug.
@@ -100,11 +127,15 @@ class MAEnv(gym.Env):
         self.reset_callback = reset_callback
         self.reward_callback = reward_callback
         self.observation_callback = observation_callback
+        self.observations_callback = observations_callback
+        self.rewards_callback = rewards_callback
+        self.dones_callback = dones_callback
         self.info_callback = info_callback
         self.done_callback = done_callback
         # environment parameters
         # if true, every agent has the same reward
         self.global_reward = global_reward
+        self.array_api = array_api
         self.t = 0
         self.episode = 0
         self.episode_limit = 60
@@ -118,10 +149,29 @@ class MAEnv(gym.Env):
 
             # observation space
             obs_dim = len(observation_callback(agent, self.world))
-            self.observation_space.append(spaces.Box(low=0.0, high=1.0, shape=(obs_dim,), dtype=float))
+            self.observation_space.append(spaces.Box(low=0.0, high=1.0, shape=(obs_dim,), dtype=self.world.dtype))
+
+        # Persistent buffer holding the observations of all policy agents
+        obs_dim = self.observation_space[0].shape[0] if self.n > 0 else 0
+        self._obs_n = np.zeros((self.n, obs_dim), dtype=self.world.dtype)
+        # Persistent buffer holding the available actions of all policy agents
+        action_dim = self.action_space[0].n if self.n > 0 else 0
+        self._avail_actions = np.zeros((self.n, action_dim), dtype=bool)
+        # Physical action (x, y movement and target id) of each action id. All policy agents share the action layout
+        self._action_table = self._build_action_table(action_dim)
+
+        # Static lookups to calculate rewards and dones of all policy agents at once
+        self._policy_ids = np.array([agent.id for agent in self.world.policy_agents], dtype=int)
+        policy_team_index = {team.tid: index for index, team in enumerate(self.world.policy_teams)}
+        self._policy_team_index = np.array([policy_team_index[agent.tid] for agent in self.world.policy_agents],
+                                           dtype=int)
+        self._policy_team_sizes = np.array([team.size for team in self.world.policy_teams], dtype=float)
+        self._team_order = [self.world.teams.index(team)  # policy teams first
+                            for team in self.world.policy_teams + self.world.scripted_teams]
 
         self.state_n = self._get_state_dim()
-        self._state = np.zeros((self.state_n,))
+        self._state = np.zeros((self.state_n,), dtype=self.world.dtype)
+        self._state_tick = None  # World tick of the cached state
 
         # rendering
         self.headless = headless
@@ -192,8 +242,8 @@ class MAEnv(gym.Env):
         avail_target_action_indices = np.where(self.world.avail_target_actions[agent.id])[0]
         avail_target_action_indices += offset  # Apply offset from no-op
         avail_actions += avail_target_action_indices.tolist()
-        self.logger.debug(
-            f"Agent {agent.id,} has available actions with indices: {avail_actions if self.log else None}")
+        if self.log:
+            self.logger.debug(f"Agent {agent.id,} has available actions with indices: {avail_actions}")
         return avail_actions
 
     def _get_state_dim(self):
@@ -231,6 +281,7 @@ class MAEnv(gym.Env):
     def step(self, action_n, heuristic_opponent=False):
         """
         Perform multi-agent environment step
+        Observations are views on a persistent buffer which is overwritten by the next step. Copy to keep them.
         @param action_n: List of actions to take for each agent
         @param heuristic_opponent:
         """
@@ -242,59 +293,69 @@ class MAEnv(gym.Env):
         if len(self.world.policy_agents) != len(action_n):  # Make sure we received an action for every agent
             raise ActionCountMismatch(len(self.world.policy_agents), len(action_n))
 
-        for aid, agent in enumerate(self.world.policy_agents):
-            self._set_action(action_n[aid], agent, self.action_space[aid])
+        actions = np.asarray(action_n, dtype=int)
+        invalid = np.flatnonzero((actions < 0) | (actions >= len(self._action_table)))
+        if len(invalid) > 0:  # Negative ids would silently index the table from its end
+            index = invalid[0]
+            raise InvalidActionId(self._policy_ids[index], actions[index], len(self._action_table))
+
+        # Decode all actions at once into the actions array of the world which backs each agents action.u
+        self.world.actions[self._policy_ids] = self._action_table[actions]
 
         self.logger.debug("Advance world state...")
         # Advance world state - this also sets actions in the scripted agents
         self.world.step()
 
-        # Record observation and reward for each agent - this needs to happen after stepping world !
-        # 2-d array holding all rewards of a policy agents team-wise
-        team_rewards = []
-        # 2-d array holding all policy agents obs
-        obs_n = []
-        # 1-d array holding all termination (goal) booleans for policy teams
-        done_n = []
         # Extra info which does not fit into gym interface f.e. who won -> not included in done bool
         info_n = {"battle_won": [], "draw": False}
 
-        # Go over all policy agents team-wise
-        for team in self.world.policy_teams:
-            # 1-d array holding all rewards of team members and as special case the win/goal reward
-            local_rewards = []
-            for agent in team.members:
-                obs_n.append(self._get_obs(agent))
-                local_rewards.append(self._get_reward(agent))
-            local_rewards = np.array(local_rewards)
-
-            # Check if the policy team won and add reward
-            won = self._get_done(team)
-            done_n.append(won)
+        if self.array_api:
+            obs_n, reward_n, done_n = self._get_step_arrays()
+            info_n["avail_actions"] = self.get_avail_actions_array()
+        else:
+            # Record observation and reward for each agent - this needs to happen after stepping world !
+            # 2-d array holding all rewards of a policy agents team-wise
+            team_rewards = []
+            # 2-d array holding all policy agents obs
+            obs_n = self._get_obs_n()
+            # 1-d array holding all termination (goal) booleans for policy teams
+            done_n = []
+
+            # Go over all policy agents team-wise
+            for team in self.world.policy_teams:
+                # 1-d array holding all rewards of team members and as special case the win/goal reward
+                local_rewards = []
+                for agent in team.members:
+                    local_rewards.append(self._get_reward(agent))
+                local_rewards = np.array(local_rewards)
+
+                # Check if the policy team won and add reward
+                won = self._get_done(team)
+                done_n.append(won)
+
+                # Calculate the reward depending on the reward function category
+                if self.global_reward:
+                    global_reward = np.sum(local_rewards) / float(team.size) + (200 if won else 0)
+                    team_rewards.append(global_reward)  # float
+                else:
+                    local_rewards += ((200.0 / team.size) if won else 0)
+                    team_rewards.append(local_rewards)  # list of floats
+
+            for team in self.world.scripted_teams:
+                # Check if scripted agents won - these agents are part of the env and do not receive obs and rewards
+                done_n.append(self._get_done(team))
+
+            self.logger.debug(f"Observations: {obs_n if self.log else None}")
 
-            # Calculate the reward depending on the reward function category
             if self.global_reward:
-                global_reward = np.sum(local_rewards) / float(team.size) + (200 if won else 0)
-                team_rewards.append(global_reward)  # float
+                reward_n = team_rewards
+                self.logger.debug(f"Global Rewards per policy controlled team: {team_rewards if self.log else None}")
             else:
-                local_rewards += ((200.0 / team.size) if won else 0)
-                team_rewards.append(local_rewards)  # list of floats
-
-        for team in self.world.scripted_teams:
-            # Check if scripted agents won - these agents are part of the env and do not receive obs and rewards
-            done_n.append(self._get_done(team))
+                reward_n = np.concatenate(team_rewards)
+                self.logger.debug(f"Local Rewards per policy controlled team: {team_rewards if self.log else None}")
 
         info_n["battle_won"] = done_n  # Provide additional info who won the episode.
 
-        self.logger.debug(f"Observations: {obs_n if self.log else None}")
-
-        if self.global_reward:
-            reward_n = team_rewards
-            self.logger.debug(f"Global Rewards per policy controlled team: {team_rewards if self.log else None}")
-        else:
-            reward_n = np.concatenate(team_rewards)
-            self.logger.debug(f"Local Rewards per policy controlled team: {team_rewards if self.log else None}")
-
         winner_id = np.where(done_n)[0]
         if len(winner_id) == 1:
             self.logger.info(f"------ Episode {self.episode} done - Team with id {winner_id} won the battle.")
@@ -309,7 +370,11 @@ class MAEnv(gym.Env):
             info_n["draw"] = True
             self.logger.info(f"------ Episode {self.episode} done - Step limit reached.")
             self.episode += 1
-            done_n = [True] * len(done_n)
+            done_n = np.ones_like(done_n) if self.array_api else [True] * len(done_n)
+
+        # Phase timings of the profiled world are provided once per episode
+        if self.world.profiler is not None and np.any(done_n):
+            info_n["profile"] = self.world.profile_stats()
 
         return obs_n, reward_n, done_n, info_n
 
@@ -321,10 +386,7 @@ class MAEnv(gym.Env):
         self.t = 0
         self.reset_callback(self.world) if self.reset_callback else None
         self._reset_render()
-        obs_n = []
-        for agent in self.world.policy_agents:
-            obs_n.append(self._get_obs(agent))
-        return obs_n
+        return self._get_obs_n()
 
     def _get_info(self, agent):
         """
@@ -339,26 +401,84 @@ class MAEnv(gym.Env):
     def get_state(self):
         """Returns the global state.
         NOTE: This function should not be used during decentralised execution.
-        """
-        state = []
-        # State includes ALL agents. Even scripted ones !
-        for agent in self.world.agents:
-            agent_obs = (agent.state.pos - self.world.center) / self.world.bounds
-            state = np.concatenate((state, agent_obs, agent.self_observation))
-        self.logger.debug(f"State: {state if self.log else None}")
-        return state
+        NOTE: The state is a persistent buffer which is overwritten when the world changed. Copy to keep it.
+        """
+        if self._state_tick == self.world.tick:  # World did not change since the last call
+            return self._state
+        self._state_tick = self.world.tick
+        # State includes ALL agents. Even scripted ones ! Each row: position, relative health and unit bits
+        dim_p = self.world.dim_p
+        state = self._state.reshape(self.world.agents_n, -1)
+        np.subtract(self.world.positions, self.world.center, out=state[:, :dim_p])
+        state[:, :dim_p] /= self.world.bounds
+        np.divide(self.world.health, self.world.max_health, out=state[:, dim_p])
+        state[:, dim_p + 1:] = self.world.unit_bits_obs
+        self.logger.debug(f"State: {self._state if self.log else None}")
+        return self._state
 
     def get_obs(self):
         """Returns all agent observations in a list.
         NOTE: Agents should have access only to their local observations
         during decentralised execution.
+        NOTE: Observations are views on a persistent buffer which is overwritten by the next step. Copy to keep them.
         """
-        return [self._get_obs(agent) for agent in self.world.policy_agents]
+        return self._get_obs_n()
 
     def get_avail_actions(self):
         """Returns the available actions of all agents in a list."""
-        avail_actions = [self.get_available_actions(agent) for agent in self.world.policy_agents]
-        return avail_actions
+        if self.array_api:
+            return self.get_avail_actions_array()
+        return list(self.get_avail_actions_array().astype(self.world.dtype))
+
+    def _get_obs_n(self):
+        """
+        Write the observations of all policy agents into the persistent obs buffer
+        :return: list of views on the buffer rows
+        """
+        if self.observations_callback is not None:
+            self.observations_callback(self.world, self._obs_n)
+        else:
+            for row, agent in enumerate(self.world.policy_agents):
+                self._obs_n[row] = self._get_obs(agent)
+        return self._obs_n if self.array_api else list(self._obs_n)
+
+    def _get_step_arrays(self):
+        """
+        Calculate observations, rewards and dones of all policy agents at once
+        :return: obs (n_policy_agents, obs_dim), rewards per policy team or agent and dones per team
+        """
+        obs_n = self._get_obs_n()
+        if self.rewards_callback is None:
+            local_rewards = np.array([self._get_reward(agent) for agent in self.world.policy_agents], dtype=float)
+        else:
+            local_rewards = np.asarray(self.rewards_callback(self.world, self._policy_ids), dtype=float)
+            self.world.stats[self._policy_ids] = 0  # reset agent stats which were used to calculate step reward
+        if self.dones_callback is None:
+            teams = self.world.policy_teams + self.world.scripted_teams
+            done_n = np.array([self._get_done(team) for team in teams], dtype=bool)
+        else:
+            done_n = np.asarray(self.dones_callback(self.world), dtype=bool)[self._team_order]
+
+        won = done_n[:len(self._policy_team_sizes)]
+        if self.global_reward:
+            team_rewards = np.bincount(self._policy_team_index, weights=local_rewards,
+                                       minlength=len(self._policy_team_sizes))
+            reward_n = team_rewards / self._policy_team_sizes + 200 * won
+        else:
+            reward_n = local_rewards + (200.0 / self._policy_team_sizes * won)[self._policy_team_index]
+        return obs_n, reward_n, done_n
+
+    def get_avail_actions_array(self):
+        """
+        Write the available actions of all policy agents into the persistent avail actions buffer: no-op followed by
+        the movement and target actions of the world. The buffer is overwritten by the next call. Copy to keep it.
+        :return: (n_policy_agents, n_actions) mask
+        """
+        movement_dims = self.world.avail_movement_actions.shape[1]
+        self._avail_actions[:, 0] = True  # no-op
+        self._avail_actions[:, 1:1 + movement_dims] = self.world.avail_movement_actions[self._policy_ids]
+        self._avail_actions[:, 1 + movement_dims:] = self.world.avail_target_actions[self._policy_ids]
+        return self._avail_actions
 
     def _get_obs(self, agent):
         """
@@ -391,6 +511,19 @@ class MAEnv(gym.Env):
         agent.stats.reset()  # reset agent stats which were used to calculate step reward for next step
         return reward
 
+    def _build_action_table(self, action_dim: int) -> np.ndarray:
+        """
+        Lookup table of the physical actions as set by _set_action() for every action id.
+        @param action_dim: number of action ids
+        @return: (action_dim, 3) table
+        """
+        table = np.zeros((action_dim, self.world.dim_p + 1))
+        table[:, 2] = -1  # no attack
+        movements = np.array([[-1.0, 0.0], [1.0, 0.0], [0.0, 1.0], [0.0, -1.0]])  # WEST, EAST, NORTH, SOUTH
+        table[1:1 + len(movements), :2] = movements[:max(action_dim - 1, 0)] * self.world.grid_size
+        table[1 + len(movements):, 2] = np.arange(max(action_dim - 1 - len(movements), 0))  # target ids
+        return table
+
     def _set_action(self, action, agent, time=None):
         """
         Set env action for a particular agent. Convert action index to environment/world state update and
@@ -401,8 +534,8 @@ class MAEnv(gym.Env):
         :param time: the current time step
         :return: None
         """
-        # set default actions (physical and communication)
-        agent.action.u = np.zeros(self.world.dim_p + 1)
+        # set default actions (physical and communication) - written in place
+        agent.action.u[:] = 0.0
 
         # physical action index
         act_ind = action
@@ -484,6 +617,9 @@ class TeamsEnv(MAEnv):
                          reset_callback=self._scenario.reset_world,
                          reward_callback=self._scenario.reward,
                          observation_callback=self._scenario.observation,
+                         observations_callback=self._scenario.observations,
+                         rewards_callback=self._scenario.rewards,
+                         dones_callback=self._scenario.dones,
                          done_callback=self._scenario.done, **kwargs)
 
     def get_spawns(self):
@@ -496,13 +632,18 @@ class BatchMultiAgentEnv(gym.Env):
         'render.modes': ['human', 'rgb_array']
     }
 
-    def __init__(self, env_batch):
+    def __init__(self, env_batch, max_workers=1):
         """
         Vectorized wrapper for a batch of multi-agent environments.
         Assumes all environments have the same observation and action space.
         :param env_batch:
+        :param max_workers: threads stepping the environments in step_async(). Scripted AIs and the step order draw
+        from the global random state, more than one thread makes seeded runs non-reproducible.
         """
         self.env_batch = env_batch
+        self.max_workers = max_workers
+        self._executor = None
+        self._pending = None
 
     @property
     def n(self):
@@ -531,10 +672,64 @@ class BatchMultiAgentEnv(gym.Env):
             done_n += done
         return obs_n, reward_n, done_n, info_n
 
+    def step_async(self, action_n, time=None):
+        """
+        Start stepping all environments in a thread pool and return immediately. Collect the results with
+        step_wait(). Use two batches to simulate one half while the policy infers the actions of the other.
+        With the default single worker the environments are stepped in order, equal to step().
+        @param action_n: actions of all environments concatenated
+        @param time:
+        @return:
+        """
+        if self._pending is not None:
+            raise AsyncStepError(pending=True)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._pending = []
+        i = 0
+        for env in self.env_batch:
+            self._pending.append(self._executor.submit(env.step, action_n[i:(i + env.n)], time))
+            i += env.n
+
+    def step_wait(self):
+        """
+        Block until the steps started by step_async() are done.
+        @return: results as returned by step()
+        """
+        if self._pending is None:
+            raise AsyncStepError(pending=False)
+        pending, self._pending = self._pending, None
+        obs_n = []
+        reward_n = []
+        done_n = []
+        info_n = {'n': []}
+        for future in pending:
+            obs, reward, done, _ = future.result()
+            obs_n += obs
+            reward_n += reward
+            done_n += done
+        return obs_n, reward_n, done_n, info_n
+
+    async def astep(self, action_n, time=None):
+        """
+        Awaitable step. The event loop stays free while the environments are stepped.
+        """
+        self.step_async(action_n, time)
+        await asyncio.gather(*[asyncio.wrap_future(future) for future in self._pending], return_exceptions=True)
+        return self.step_wait()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self._pending = None
+        for env in self.env_batch:
+            env.close()
+
     def reset(self):
         obs_n = []
         for env in self.env_batch:
-            obs_n += env.clear()
+            obs_n += env.reset()
         return obs_n
 
     def render(self, mode='human', close=True):
@@ -542,3 +737,196 @@ class BatchMultiAgentEnv(gym.Env):
         for env in self.env_batch:
             results_n += env.render(mode, close)
         return results_n
+
+
+# Commands sent to environment workers
+_STEP, _RESET, _CLOSE = b"s", b"r", b"c"
+_OK, _ERROR = b"o", b"e"
+
+
+def _env_worker(conn, index: int, buffers, env_kwargs: dict, seed):
+    """
+    Runs a TeamsEnv in a worker process. Actions are read from and results are written to the shared buffers at the
+    index of the worker. The pipe only transports single byte commands and acknowledgements.
+    """
+    env = None
+    try:
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed)
+        env = TeamsEnv(**env_kwargs, seed=seed)
+        obs, actions, avail_actions = buffers["obs"][index], buffers["actions"][index], buffers["avail_actions"][index]
+        rewards, dones, battle_won, draws = buffers["rewards"], buffers["dones"], buffers["battle_won"], buffers["draws"]
+        while True:
+            command = conn.recv_bytes()
+            if command == _STEP:
+                obs_n, rewards[index], dones[index], info = env.step(actions)
+                battle_won[index] = info["battle_won"]
+                draws[index] = info["draw"]
+                if np.any(dones[index]):  # Auto-reset finished episodes
+                    obs_n = env.reset()
+                obs[:] = obs_n
+                avail_actions[:] = env.get_avail_actions()
+            elif command == _RESET:
+                obs[:] = env.reset()
+                avail_actions[:] = env.get_avail_actions()
+            elif command == _CLOSE:
+                conn.send_bytes(_OK)
+                break
+            conn.send_bytes(_OK)
+    except (KeyboardInterrupt, EOFError):
+        pass
+    except Exception:
+        conn.send_bytes(_ERROR + traceback.format_exc().encode())
+    finally:
+        if env is not None:
+            env.close()
+        buffers.close()
+        conn.close()
+
+
+class SubprocBatchMultiAgentEnv(gym.Env):
+    metadata = {
+        'runtime.vectorized': True,
+    }
+
+    def __init__(self, n_envs: int, seed=None, start_method=None, **kwargs):
+        """
+        Vectorized environment stepping a batch of TeamsEnv in parallel worker processes.
+        Observations, rewards, dones and available actions are written by the workers into shared memory and returned
+        as (n_envs, ...) arrays. These are overwritten by the next step - copy to keep them.
+        Finished environments are reset automatically. Their returned observations are the first of the next episode.
+        @param n_envs: number of environments/workers
+        @param seed: seed of the first worker. The worker with index i is seeded with seed + i.
+        @param start_method: multiprocessing start method, defaults to the platform default
+        @param kwargs: arguments of each TeamsEnv
+        """
+        from maenv.utils.shared_arrays import SharedArrays  # multiprocessing.shared_memory requires Python 3.8
+
+        self.n_envs = n_envs
+        self.env_kwargs = dict(kwargs, headless=True, array_api=True)
+
+        # Build one environment to determine the buffer shapes
+        env = TeamsEnv(**self.env_kwargs)
+        self.n = env.n
+        self.observation_space = env.observation_space
+        self.action_space = env.action_space
+        self.env_info = env.get_env_info()
+        teams_n = len(env.world.teams)
+        rewards_n = len(env.world.policy_teams) if env.global_reward else env.n
+        env.close()
+
+        self.buffers = SharedArrays({
+            "obs": ((n_envs, self.n, self.observation_space[0].shape[0]), self.observation_space[0].dtype),
+            "actions": ((n_envs, self.n), int),
+            "avail_actions": ((n_envs, self.n, self.action_space[0].n), bool),
+            "rewards": ((n_envs, rewards_n), float),
+            "dones": ((n_envs, teams_n), bool),
+            "battle_won": ((n_envs, teams_n), bool),
+            "draws": ((n_envs,), bool),
+        })
+
+        context = multiprocessing.get_context(start_method)
+        self.conns, self.processes = [], []
+        for index in range(n_envs):
+            conn, worker_conn = context.Pipe()
+            worker_seed = None if seed is None else seed + index
+            process = context.Process(target=_env_worker, daemon=True,
+                                      args=(worker_conn, index, self.buffers, self.env_kwargs, worker_seed))
+            process.start()
+            worker_conn.close()
+            self.conns.append(conn)
+            self.processes.append(process)
+        self.waiting = False
+        self.closed = False
+
+    def _send(self, command: bytes):
+        for conn in self.conns:
+            conn.send_bytes(command)
+
+    def _wait(self):
+        responses = [conn.recv_bytes() for conn in self.conns]  # Collect all to keep the pipes in sync
+        for index, response in enumerate(responses):
+            if response[:1] == _ERROR:
+                raise EnvironmentWorkerError(index, response[1:].decode())
+
+    def step(self, action_n):
+        """
+        Step all environments.
+        @param action_n: (n_envs, n) action ids of the policy agents
+        @return: obs (n_envs, n, obs_dim), rewards, dones (n_envs, n_teams), info with available actions
+        """
+        self.step_async(action_n)
+        return self.step_wait()
+
+    def step_async(self, action_n):
+        """
+        Start stepping all environments and return immediately. Collect the results with step_wait().
+        @param action_n: (n_envs, n) action ids of the policy agents
+        @return:
+        """
+        if self.waiting:
+            raise AsyncStepError(pending=True)
+        self.buffers["actions"][:] = action_n
+        self._send(_STEP)
+        self.waiting = True
+
+    def step_wait(self):
+        """
+        Block until the steps started by step_async() are done.
+        @return: results as returned by step()
+        """
+        if not self.waiting:
+            raise AsyncStepError(pending=False)
+        self.waiting = False
+        self._wait()
+        info = {
+            "battle_won": self.buffers["battle_won"],
+            "draw": self.buffers["draws"],
+            "avail_actions": self.buffers["avail_actions"],
+        }
+        return self.buffers["obs"], self.buffers["rewards"], self.buffers["dones"], info
+
+    async def astep(self, action_n):
+        """
+        Awaitable step. The event loop stays free while the workers step their environments.
+        """
+        self.step_async(action_n)
+        return await asyncio.get_running_loop().run_in_executor(None, self.step_wait)
+
+    def reset(self):
+        if self.waiting:
+            raise AsyncStepError(pending=True)
+        self._send(_RESET)
+        self._wait()
+        return self.buffers["obs"]
+
+    def get_avail_actions(self):
+        return self.buffers["avail_actions"]
+
+    def get_env_info(self):
+        return self.env_info
+
+    def close(self):
+        if self.closed:
+            return
+        if self.waiting:  # Drain the pending step
+            self.waiting = False
+            try:
+                self._wait()
+            except (EnvironmentWorkerError, OSError, EOFError):
+                pass
+        for conn in self.conns:
+            try:
+                conn.send_bytes(_CLOSE)
+                conn.recv_bytes()
+            except (OSError, EOFError):  # Worker already terminated
+                pass
+            conn.close()
+        for process in self.processes:
+            process.join()
+        self.buffers.close(unlink=True)
+        self.closed = True
+
+    def render(self, mode='human'):
+        raise NotImplementedError("Subprocess environments are headless.")
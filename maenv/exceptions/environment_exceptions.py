@@ -6,3 +6,19 @@ class TooManyWinners(Exception):
 class ActionCountMismatch(Exception):
     def __init__(self, expected, served):
         super().__init__(f"The environment expected {expected} instead of {served} action ids.")
+
+
+class InvalidActionId(Exception):
+    def __init__(self, agent_id, action, n_actions):
+        super().__init__(f"Agent {agent_id} served action id {action} outside of the {n_actions} available actions.")
+
+
+class EnvironmentWorkerError(Exception):
+    def __init__(self, worker, trace):
+        super().__init__(f"Environment worker {worker} failed:\n{trace}")
+
+
+class AsyncStepError(Exception):
+    def __init__(self, pending):
+        state = "still waits for a step" if pending else "has no pending step"
+        super().__init__(f"The environment {state}. Alternate step_async() and step_wait().")
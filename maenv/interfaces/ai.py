@@ -11,6 +11,15 @@ class ScriptedAI(object):
     def act(self, agent: Agent, world: World) -> Action:
         raise NotImplementedError()
 
+    def act_batch(self, world: World):
+        """
+        Set the actions of all alive scripted agents in the world. Override to vectorize the action selection.
+        @param world:
+        @return:
+        """
+        for agent in world.alive_scripted_agents:
+            self.act(agent, world)
+
     def _get_target(self, world) -> int:
         """
         Implement basic targeting with the provided masked distances.
@@ -1,3 +1,5 @@
+import numpy as np
+
 from maenv.core import World, Team, Agent, Action
 
 
@@ -97,6 +99,35 @@ class BaseTeamScenario(object):
         """
         raise NotImplementedError()
 
+    def observations(self, world: World, out):
+        """
+        Write the observations of all policy agents into the rows of the given buffer. Override to batch the
+        calculation, defaults to calling observation() per agent.
+        :param world:
+        :param out: (n_policy_agents, obs_dim) buffer
+        :return: out
+        """
+        for row, agent in enumerate(world.policy_agents):
+            out[row] = self.observation(agent, world)
+        return out
+
+    def rewards(self, world: World, agent_ids):
+        """
+        Batched variant of reward() for the given agents. Override to vectorize the calculation.
+        :param world:
+        :param agent_ids: ids of the rewarded agents
+        :return: reward per agent
+        """
+        return np.array([self.reward(world.agents[aid], world) for aid in agent_ids], dtype=float)
+
+    def dones(self, world: World):
+        """
+        Batched variant of done() for all teams. Override to vectorize the calculation.
+        :param world:
+        :return: boolean per team in the order of world.teams
+        """
+        return np.array([self.done(team, world) for team in world.teams], dtype=bool)
+
     def done(self, team: Team, world: World):
         """
         Return if this team has achieved his goal
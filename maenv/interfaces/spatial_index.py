@@ -0,0 +1,42 @@
+import numpy as np
+
+NEIGHBOUR_PAIRS_DTYPE = np.dtype([('i', np.intp), ('j', np.intp), ('v', np.float64)])
+
+
+class SpatialIndex(object):
+    """
+    Defines how range queries over the agent positions are answered. Inherit and implement to create custom indices.
+    """
+
+    def build(self, positions: np.ndarray):
+        """
+        (Re-)build the index from all agent positions.
+        @param positions: (n, 2) positions of all agents
+        @return:
+        """
+        raise NotImplementedError()
+
+    def update(self, positions: np.ndarray, moved: np.ndarray):
+        """
+        Update the index after only the given agents changed their positions. Rebuilds by default.
+        @param positions: (n, 2) positions of all agents
+        @param moved: ids of the agents which moved since the last build or update
+        @return:
+        """
+        self.build(positions)
+
+    def query_pairs(self, radius: float) -> np.ndarray:
+        """
+        Find all pairs of agents within the radius of each other. Each agent is paired with itself.
+        @param radius:
+        @return: structured array with the agent ids (i, j) and distance (v) of each pair
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    def _pairs(agents: np.ndarray, others: np.ndarray, distances: np.ndarray) -> np.ndarray:
+        pairs = np.empty(len(agents), dtype=NEIGHBOUR_PAIRS_DTYPE)
+        pairs['i'] = agents
+        pairs['j'] = others
+        pairs['v'] = distances
+        return pairs
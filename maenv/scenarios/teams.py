@@ -1,7 +1,7 @@
 import random
 
 import numpy as np
-from maenv.core import World, Agent, Team
+from maenv.core import World, Agent, Team, STATS_FIELDS
 from maenv.exceptions.scenario_exceptions import ScenarioNotSymmetricError
 from maenv.interfaces.scenario import BaseTeamScenario
 from maenv.utils.colors import generate_colors
@@ -15,6 +15,13 @@ class TeamsScenario(BaseTeamScenario):
                  random_spawns: bool = False,
                  stochastic_spawns: bool = False,
                  attack_range_only: bool = False,
+                 spatial_index: str = "kd_tree",
+                 vectorized: bool = False,
+                 seed=None,
+                 policy_obs_only: bool = False,
+                 obs_k: int = None,
+                 dtype=np.float64,
+                 profile: bool = False,
                  **kwargs):
         """
         Constructor for a team scenario.
@@ -30,6 +37,13 @@ class TeamsScenario(BaseTeamScenario):
         self.ai = ai
         self.ai_config = ai_config
         self.attack_range_only = attack_range_only
+        self.spatial_index = spatial_index
+        self.vectorized = vectorized
+        self.seed = seed
+        self.policy_obs_only = policy_obs_only
+        self.obs_k = obs_k
+        self.dtype = dtype
+        self.profile = profile
         self.teams_n = len(match_build_plan)
         self.agents_n = [len(team["units"]) for team in match_build_plan]
         self.is_symmetric = self.agents_n.count(self.agents_n[0]) == len(self.agents_n) # each agent n must be the same
@@ -38,6 +52,7 @@ class TeamsScenario(BaseTeamScenario):
             raise ScenarioNotSymmetricError(self.agents_n, self.teams_n)
 
         self.team_spawns = None
+        self.spawns = None  # Spawns of all agents ordered by agent id
         if "agent_spawns" in self.match_build_plan:
             self.agent_spawns = self.match_build_plan["agent_spawns"]
         else:
@@ -53,7 +68,10 @@ class TeamsScenario(BaseTeamScenario):
         total_n_agents = sum(self.agents_n)
 
         world = World(n_agents=total_n_agents, n_teams=self.teams_n, grid_size=self.grid_size, ai=self.ai,
-                      ai_config=self.ai_config, attack_range_only=self.attack_range_only)
+                      ai_config=self.ai_config, attack_range_only=self.attack_range_only,
+                      spatial_index=self.spatial_index, vectorized=self.vectorized, seed=self.seed,
+                      policy_obs_only=self.policy_obs_only, obs_k=self.obs_k,
+                      dtype=self.dtype, profile=self.profile)
 
         colors = generate_colors(self.teams_n)
         agent_count = 0
@@ -87,6 +105,7 @@ class TeamsScenario(BaseTeamScenario):
             self.team_spawns = world.spg.generate_team_spawns(randomize=self.random_spawns, radius=team_spread)
             if random.random() < 0.5:
                 self.team_spawns[0], self.team_spawns[1] = self.team_spawns[1], self.team_spawns[0]
+            self.spawns = None
 
         if self.stochastic_spawns or any([spawn is None for spawn in self.agent_spawns]):
             # take first teams size since symmetric for spawn generation
@@ -94,11 +113,12 @@ class TeamsScenario(BaseTeamScenario):
             # mirror spawns
             self.agent_spawns[0] = agent_spawns + self.team_spawns[0]
             self.agent_spawns[1] = (- agent_spawns) + self.team_spawns[1]
+            self.spawns = None
 
-        for team, team_spawn in zip(world.teams, self.team_spawns):
-            for team_intern_id, agent in enumerate(team.members):
-                spawn = self.agent_spawns[team.tid][team_intern_id]
-                world.connect(agent, spawn)
+        if self.spawns is None:  # Agent ids are assigned team-wise in the order of the teams
+            self.spawns = np.concatenate([self.agent_spawns[team.tid][:team.size] for team in world.teams])
+
+        world.reset_agents(self.spawns)
 
         world.init() # Init after all agents added
 
@@ -108,12 +128,33 @@ class TeamsScenario(BaseTeamScenario):
         reward += agent.stats.kills * 10
         return reward
 
+    def rewards(self, world: World, agent_ids):
+        stats = world.stats[agent_ids]
+        rewards = stats[:, STATS_FIELDS.index("dmg_dealt")] / world.attack_damages[agent_ids] * 2
+        rewards += stats[:, STATS_FIELDS.index("kills")] * 10
+        return rewards
+
     def done(self, team: Team, world: World):
         if np.all(world.wiped_teams):  # if all teams are wiped simultaneously -> done
             return True
         # if only one team is not wiped and this team is the team under testing -> winner winner chicken dinner
         return not world.wiped_teams[team.tid] and world.wiped_teams.count(False) == 1
 
+    def dones(self, world: World):
+        wiped = np.array(world.wiped_teams, dtype=bool)
+        if np.all(wiped):
+            return wiped
+        return ~wiped & (np.count_nonzero(~wiped) == 1)
+
     def observation(self, agent: Agent, world: World):
         other_obs = world.obs[agent.id].flatten()
         return np.concatenate((other_obs, agent.self_observation))
+
+    def observations(self, world: World, out: np.ndarray):
+        ids = [agent.id for agent in world.policy_agents]
+        others_dim = world.obs.shape[1] * world.obs_dims
+        # Observations of other agents followed by the self observation (relative health and unit bits)
+        np.take(world.obs.reshape(world.agents_n, others_dim), ids, axis=0, out=out[:, :others_dim])
+        np.divide(world.health[ids], world.max_health[ids], out=out[:, others_dim])
+        out[:, others_dim + 1:] = world.unit_bits_obs[ids]
+        return out
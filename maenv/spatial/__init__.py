@@ -0,0 +1,9 @@
+from .brute_force_index import BruteForceSpatialIndex
+from .grid_index import GridSpatialIndex
+from .kd_tree_index import KDTreeSpatialIndex
+
+REGISTRY = {
+    "kd_tree": KDTreeSpatialIndex,
+    "grid": GridSpatialIndex,
+    "brute_force": BruteForceSpatialIndex,
+}
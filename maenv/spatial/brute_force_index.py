@@ -0,0 +1,23 @@
+import numpy as np
+
+from maenv.interfaces.spatial_index import SpatialIndex
+
+
+class BruteForceSpatialIndex(SpatialIndex):
+    def __init__(self):
+        """
+        Spatial index comparing all pairs of positions. Fastest for tiny worlds with only a few agents.
+        """
+        self.positions = None
+
+    def build(self, positions: np.ndarray):
+        self.positions = positions.copy()
+
+    def update(self, positions: np.ndarray, moved: np.ndarray):
+        self.positions[moved] = positions[moved]
+
+    def query_pairs(self, radius: float) -> np.ndarray:
+        differences = self.positions[np.newaxis, :, :] - self.positions[:, np.newaxis, :]
+        distances = np.hypot(differences[..., 0], differences[..., 1])
+        agents, others = np.nonzero(distances <= radius)
+        return self._pairs(agents, others, distances[agents, others])
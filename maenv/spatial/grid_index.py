@@ -0,0 +1,82 @@
+import math
+
+import numpy as np
+
+from maenv.interfaces.spatial_index import SpatialIndex
+
+# Bucket coordinate of agents without a (finite) position
+NO_BUCKET = 2 ** 20
+
+
+class GridSpatialIndex(SpatialIndex):
+    def __init__(self, cell_size: float = None):
+        """
+        Spatial index sorting the agents into buckets of a uniform grid. Only agents which moved are re-bucketed and the
+        bucket order is only re-sorted if an agent changed its bucket. Range queries only compare agents of
+        neighbouring buckets.
+        @param cell_size: edge length of a bucket. Defaults to the radius of the first query.
+        """
+        self.cell_size = cell_size
+        self.positions = None
+        self.buckets = None
+        self._order = None
+        self._sorted_keys = None
+
+    def build(self, positions: np.ndarray):
+        self.positions = positions.astype(float)
+        if self.cell_size is not None:
+            self.buckets = self._bucket(self.positions)
+            self._order = None
+
+    def update(self, positions: np.ndarray, moved: np.ndarray):
+        if len(moved) == 0:
+            return
+        self.positions[moved] = positions[moved]
+        if self.buckets is None:
+            return
+        buckets = self._bucket(self.positions[moved])
+        if np.any(buckets != self.buckets[moved]):  # Bucket order changes only if a bucket was left
+            self.buckets[moved] = buckets
+            self._order = None
+
+    def query_pairs(self, radius: float) -> np.ndarray:
+        if self.cell_size is None:
+            self.cell_size = radius
+            self.build(self.positions)
+        if self._order is None:
+            keys = self._key(self.buckets)
+            self._order = np.argsort(keys, kind="stable")
+            self._sorted_keys = keys[self._order]
+
+        span = max(int(math.ceil(radius / self.cell_size)), 1)
+        agents_n = len(self.positions)
+        agents, others = [], []
+        for dx in range(-span, span + 1):
+            for dy in range(-span, span + 1):
+                keys = self._key(self.buckets + [dx, dy])
+                lows = np.searchsorted(self._sorted_keys, keys, side="left")
+                counts = np.searchsorted(self._sorted_keys, keys, side="right") - lows
+                total = np.sum(counts)
+                if total == 0:
+                    continue
+                # Expand the [low, low + count) ranges of all agents into candidate pairs
+                starts = np.repeat(lows - (np.cumsum(counts) - counts), counts)
+                agents.append(np.repeat(np.arange(agents_n), counts))
+                others.append(self._order[starts + np.arange(total)])
+        if len(agents) == 0:
+            return self._pairs(np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0))
+        agents, others = np.concatenate(agents), np.concatenate(others)
+        differences = self.positions[others] - self.positions[agents]
+        distances = np.hypot(differences[:, 0], differences[:, 1])
+        in_range = distances <= radius
+        return self._pairs(agents[in_range], others[in_range], distances[in_range])
+
+    def _bucket(self, positions: np.ndarray) -> np.ndarray:
+        finite = np.all(np.isfinite(positions), axis=1)
+        buckets = np.full(positions.shape, NO_BUCKET, dtype=np.int64)
+        buckets[finite] = np.floor(positions[finite] / self.cell_size)
+        return buckets
+
+    @staticmethod
+    def _key(buckets: np.ndarray) -> np.ndarray:
+        return (buckets[:, 0] + NO_BUCKET) * (4 * NO_BUCKET) + (buckets[:, 1] + NO_BUCKET)
@@ -0,0 +1,22 @@
+import numpy as np
+import scipy.spatial.ckdtree
+
+from maenv.interfaces.spatial_index import SpatialIndex
+
+
+class KDTreeSpatialIndex(SpatialIndex):
+    def __init__(self):
+        """
+        Spatial index rebuilding a KD-tree from all positions whenever an agent moved.
+        """
+        self.tree = None
+
+    def build(self, positions: np.ndarray):
+        self.tree = scipy.spatial.cKDTree(data=positions)
+
+    def update(self, positions: np.ndarray, moved: np.ndarray):
+        if len(moved) > 0:  # The tree is still valid if no agent moved
+            self.build(positions)
+
+    def query_pairs(self, radius: float) -> np.ndarray:
+        return self.tree.sparse_distance_matrix(self.tree, radius, output_type='ndarray')
@@ -0,0 +1,252 @@
+"""
+Vectorized world kernels operating on arrays with a leading batch axis (B, n_agents, ...).
+A single world is processed by passing its arrays with a batch axis of size one (f.e. world.positions[None]).
+"""
+import numpy as np
+
+
+def pairwise_distances(positions: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Euclidean distance of every agent to every other agent.
+    @param positions: (B, n, 2) agent positions
+    @param out: optional (B, n, n) output buffer
+    @return: (B, n, n) distances
+    """
+    differences = positions[..., np.newaxis, :, :] - positions[..., :, np.newaxis, :]
+    return np.hypot(differences[..., 0], differences[..., 1], out=out)
+
+
+def range_mask(distances: np.ndarray, ranges: np.ndarray, alive: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Mask of all agents within the range of an agent. Dead agents neither see/reach nor are seen/reached.
+    @param distances: (B, n, n) distances
+    @param ranges: (n,) or (B, n) range of each agent
+    @param alive: (B, n) alive status
+    @param out: optional (B, n, n) boolean output buffer
+    @return: (B, n, n) boolean mask
+    """
+    out = np.less_equal(distances, ranges[..., np.newaxis], out=out)
+    out &= alive[..., :, np.newaxis]
+    out &= alive[..., np.newaxis, :]
+    return out
+
+
+def find_occupants(positions: np.ndarray, queries: np.ndarray, mask: np.ndarray = None) -> np.ndarray:
+    """
+    Find the agent occupying each of the queried positions within the same batch entry.
+    @param positions: (B, n, 2) agent positions
+    @param queries: (B, m, 2) positions to look up
+    @param mask: optional (B, n) mask of agents which can occupy a position (f.e. alive agents)
+    @return: (B, m) index of an occupying agent or -1 if the position is free
+    """
+    batch_n, queries_n = queries.shape[:2]
+    query_batches = np.repeat(np.arange(batch_n), queries_n)
+    occupants = lookup_occupants(positions, query_batches, queries.reshape(-1, queries.shape[-1]), mask=mask)
+    return occupants.reshape(batch_n, queries_n)
+
+
+def lookup_occupants(positions: np.ndarray, query_batches: np.ndarray, queries: np.ndarray,
+                     mask: np.ndarray = None) -> np.ndarray:
+    """
+    Flat variant of find_occupants. Positions are hashed into sortable complex keys, which keeps memory linear in the
+    number of agents and queries.
+    @param positions: (B, n, 2) agent positions
+    @param query_batches: (m,) batch entry of each query
+    @param queries: (m, 2) positions to look up
+    @param mask: optional (B, n) mask of agents which can occupy a position
+    @return: (m,) index of an occupying agent or -1 if the position is free
+    """
+    batch_n, agents_n = positions.shape[:2]
+    result = np.full(len(queries), -1, dtype=int)
+    if len(queries) == 0 or agents_n == 0:
+        return result
+    # Shift batch entries apart on the x-axis so that keys of different entries never collide
+    xs = np.concatenate((positions[..., 0].ravel(), queries[:, 0]))
+    xs = xs[np.isfinite(xs)]  # Unplaced agents hold NaN positions
+    x_min = xs.min() if len(xs) > 0 else 0
+    x_span = xs.max() - x_min + 1 if len(xs) > 0 else 1
+    position_keys = (positions[..., 0] - x_min + np.arange(batch_n)[:, np.newaxis] * x_span) + 1j * positions[..., 1]
+    query_keys = (queries[:, 0] - x_min + query_batches * x_span) + 1j * queries[:, 1]
+
+    ids = np.broadcast_to(np.arange(agents_n), (batch_n, agents_n))
+    if mask is not None:
+        position_keys, ids = position_keys[mask], ids[mask]
+    else:
+        position_keys, ids = position_keys.ravel(), ids.ravel()
+    finite = np.isfinite(position_keys)  # Agents without a position occupy nothing
+    position_keys, ids = position_keys[finite], ids[finite]
+    if len(position_keys) == 0:
+        return result
+
+    order = np.argsort(position_keys)
+    sorted_keys = position_keys[order]
+    indices = np.minimum(np.searchsorted(sorted_keys, query_keys), len(sorted_keys) - 1)
+    found = sorted_keys[indices] == query_keys
+    result[found] = ids[order][indices[found]]
+    return result
+
+
+def group_positions(keys: np.ndarray) -> np.ndarray:
+    """
+    Position of each element within its group of equal keys. Keys have to be sorted.
+    @param keys: sorted 1-d keys
+    @return: 0 for the first element of a group, 1 for the second, ...
+    """
+    if len(keys) == 0:
+        return np.zeros(0, dtype=int)
+    index = np.arange(len(keys))
+    group_start = np.ones(len(keys), dtype=bool)
+    group_start[1:] = keys[1:] != keys[:-1]
+    return index - np.maximum.accumulate(np.where(group_start, index, 0))
+
+
+def resolve_combat(health, max_health, targets, acting, ranks, team_affiliations, has_heal, attack_damage,
+                   reachability, dmg_dealt, dmg_received, dmg_healed, kills):
+    """
+    Resolve all attacks and heals of a step at once. The result equals processing the acting agents one after
+    another in the order given by their rank:
+    - Heals are applied to alive, injured team mates and are clamped to the max health.
+    - Attacks are applied to reachable enemies. Every attack leaving its target dead counts as a kill.
+    Targets receiving only attacks are resolved in closed form. Targets also receiving heals are resolved in rounds,
+    one round per incoming action on the most targeted agent.
+
+    Health and stats are updated in place. Attacks of non-healers against team mates have to be filtered before.
+    @param health: (B, n) health
+    @param max_health: (n,) max health
+    @param targets: (B, n) target id per agent, -1 if no target
+    @param acting: (B, n) mask of agents whose action is processed
+    @param ranks: (B, n) processing order of the agents
+    @param team_affiliations: (n,) team id per agent
+    @param has_heal: (n,) boolean if the agent is a healer
+    @param attack_damage: (n,) damage or heal amount per agent
+    @param reachability: (B, n, n) reachability before the step
+    @param dmg_dealt: (B, n) stats
+    @param dmg_received: (B, n) stats
+    @param dmg_healed: (B, n) stats
+    @param kills: (B, n) stats
+    @return:
+    """
+    bs, agents = np.nonzero(acting & (targets >= 0))
+    others = targets[bs, agents].astype(int)
+    heals = has_heal[agents]
+    mates = team_affiliations[agents] == team_affiliations[others]
+    # Healers only influence mates, attackers only reachable enemies
+    valid = np.where(heals, mates, ~mates & reachability[bs, agents, others].astype(bool))
+    bs, agents, others, heals = bs[valid], agents[valid], others[valid], heals[valid]
+    if len(bs) == 0:
+        return
+
+    # Sort actions by target and within a target by processing order
+    order = np.lexsort((ranks[bs, agents], others, bs))
+    bs, agents, others, heals = bs[order], agents[order], others[order], heals[order]
+    target_keys = bs * health.shape[1] + others
+    turn = group_positions(target_keys)
+
+    # Targets which are healed need sequential processing, all others are attacked only
+    healed_targets = np.unique(target_keys[heals])
+    sequential = np.isin(target_keys, healed_targets)
+
+    attacked = ~sequential
+    if np.any(attacked):
+        b, a, t = bs[attacked], agents[attacked], others[attacked]
+        damage = attack_damage[a].astype(health.dtype)
+        # Damage dealt to the target up to and including each attack
+        cumulative = np.cumsum(damage)
+        first = turn[attacked] == 0
+        dealt = cumulative - (cumulative - damage)[first][np.cumsum(first) - 1]
+        kills[b, a] += health[b, t] - dealt <= 0
+        dmg_dealt[b, a] += damage
+        np.add.at(dmg_received, (b, t), damage)
+        np.subtract.at(health, (b, t), damage)
+
+    for current_turn in range(turn[sequential].max() + 1 if np.any(sequential) else 0):
+        current = sequential & (turn == current_turn)
+        b, a, t, h = bs[current], agents[current], others[current], heals[current]
+        damage = attack_damage[a].astype(health.dtype)
+        before = health[b, t]
+        can_heal = h & (before > 0) & (before < max_health[t])
+        healed = np.minimum(before + damage, max_health[t])
+        after = np.where(can_heal, healed, np.where(h, before, before - damage))
+        health[b, t] = after
+        dmg_healed[b[can_heal], a[can_heal]] += (healed - before)[can_heal]
+        dmg_dealt[b[~h], a[~h]] += damage[~h]
+        dmg_received[b[~h], t[~h]] += damage[~h]
+        kills[b[~h], a[~h]] += after[~h] <= 0
+
+
+def resolve_movement(positions, moves, movers, ranks, occupants_mask):
+    """
+    Move all agents at once. The result equals moving the agents one after another in the order given by their rank,
+    where a move is only performed if no agent of the occupants mask stands on the destination at that time:
+    - A move into a cell left by an agent with a lower rank succeeds.
+    - Of all moves into the same free cell only the lowest ranked succeeds.
+    Each iteration resolves every agent whose lower ranked dependencies are resolved.
+
+    Positions are updated in place. Moves which could not be performed are reset to zero.
+    @param positions: (B, n, 2) positions
+    @param moves: (B, n, 2) move vector per agent
+    @param movers: (B, n) mask of agents which try to move
+    @param ranks: (B, n) processing order of the agents
+    @param occupants_mask: (B, n) mask of agents blocking a position (f.e. alive agents)
+    @return: (B, n) mask of agents which moved
+    """
+    movers = movers & np.any(moves != 0, axis=-1)
+    moved = np.zeros(movers.shape, dtype=bool)
+    bs, agents = np.nonzero(movers)
+    if len(bs) == 0:
+        return moved
+    destinations = positions[bs, agents] + moves[bs, agents]
+    occupants = lookup_occupants(positions, bs, destinations, mask=occupants_mask)
+
+    # Index of the occupant within the movers, -1 if the occupant does not move
+    mover_index = np.full(movers.shape, -1, dtype=int)
+    mover_index[bs, agents] = np.arange(len(bs))
+    occupied = occupants >= 0
+    occupant_mover = np.full(len(bs), -1, dtype=int)
+    occupant_mover[occupied] = mover_index[bs[occupied], occupants[occupied]]
+    own_rank = ranks[bs, agents]
+    occupant_rank = np.where(occupied, ranks[bs, np.maximum(occupants, 0)], -1)
+    # Free if nobody occupies the destination, blocked if the occupant stays or moves after this agent
+    blocked = occupied & ((occupant_mover < 0) | (occupant_rank > own_rank))
+    waits_for_occupant = occupied & ~blocked
+
+    # Group movers by destination and order them by rank
+    order = np.lexsort((own_rank, destinations[:, 1], destinations[:, 0], bs))
+    sorted_keys = np.column_stack((bs, destinations))[order]
+    new_group = np.ones(len(order), dtype=bool)
+    new_group[1:] = np.any(sorted_keys[1:] != sorted_keys[:-1], axis=1)
+    group_starts = np.flatnonzero(new_group)
+    group_ids = np.cumsum(new_group) - 1
+
+    success = np.full(len(bs), -1, dtype=int)  # -1 = unresolved, 0 = blocked, 1 = moved
+    success[blocked] = 0
+    while np.any(success < 0):
+        # Destination free at the agents turn? 1 = yes, 0 = no, -1 = unknown
+        free = np.ones(len(bs), dtype=int)
+        free[blocked] = 0
+        free[waits_for_occupant] = success[occupant_mover[waits_for_occupant]]
+        # Outcome of all lower ranked movers into the same destination
+        sorted_success = success[order]
+        earlier_moved = _exclusive_group_sum(sorted_success == 1, group_starts, group_ids)
+        earlier_unknown = _exclusive_group_sum(sorted_success < 0, group_starts, group_ids)
+        resolved = np.full(len(bs), -1, dtype=int)
+        resolved[order[earlier_moved > 0]] = 0
+        resolved[order[(earlier_moved == 0) & (earlier_unknown == 0)]] = 1
+        resolved[free == 0] = 0
+        resolved[(free < 0) & (resolved == 1)] = -1
+        unresolved = success < 0
+        success[unresolved] = resolved[unresolved]
+
+    succeeded = success == 1
+    positions[bs[succeeded], agents[succeeded]] = destinations[succeeded]
+    moves[bs[~succeeded], agents[~succeeded]] = 0
+    moved[bs[succeeded], agents[succeeded]] = True
+    return moved
+
+
+def _exclusive_group_sum(values: np.ndarray, group_starts: np.ndarray, group_ids: np.ndarray) -> np.ndarray:
+    """
+    Sum of all preceding values within the same group of a sorted array.
+    """
+    exclusive = np.cumsum(values) - values
+    return exclusive - exclusive[group_starts][group_ids]
@@ -0,0 +1,67 @@
+import numpy as np
+
+
+class OccupancyIndex(object):
+    def __init__(self):
+        """
+        Hashed index of the positions occupied by agents. Allows to look up the occupants of a position in O(1)
+        instead of comparing against all agent positions. Positions are keyed by their exact coordinates since
+        they are not required to be aligned to the grid.
+        """
+        self._occupants = {}  # position key -> ids of the agents on this position
+        self._keys = {}  # agent id -> position key
+
+    @staticmethod
+    def key(pos: np.array) -> tuple:
+        return tuple(pos.tolist())
+
+    def add(self, agent_id: int, pos: np.array):
+        """
+        Place an agent on a position. A previously indexed position of the agent is released.
+        @param agent_id:
+        @param pos:
+        @return:
+        """
+        self.remove(agent_id)
+        key = self.key(pos)
+        self._keys[agent_id] = key
+        self._occupants.setdefault(key, set()).add(agent_id)
+
+    def remove(self, agent_id: int):
+        """
+        Release the position of an agent f.e. after its death.
+        @param agent_id:
+        @return:
+        """
+        key = self._keys.pop(agent_id, None)
+        if key is None:
+            return
+        occupants = self._occupants[key]
+        occupants.discard(agent_id)
+        if not occupants:
+            del self._occupants[key]
+
+    def occupants(self, pos: np.array) -> set:
+        """
+        @param pos:
+        @return: ids of all agents indexed on the given position
+        """
+        return self._occupants.get(self.key(pos), ())
+
+    def reset(self, positions: np.array):
+        """
+        Index all agents at once. The agent id is the row of its position.
+        @param positions:
+        @return:
+        """
+        self._keys = dict(enumerate(map(tuple, positions.tolist())))
+        self._occupants = {}
+        for agent_id, key in self._keys.items():
+            self._occupants.setdefault(key, set()).add(agent_id)
+
+    def clear(self):
+        self._occupants.clear()
+        self._keys.clear()
+
+    def __len__(self):
+        return len(self._keys)
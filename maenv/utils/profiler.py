@@ -0,0 +1,105 @@
+import time
+
+import numpy as np
+
+# Phases of World.step() and World.init(). (name, method of the world)
+STEP_PHASES = [
+    ("stepable_pos", "_calculate_stepable_pos"),
+    ("ai", "_act_scripted"),
+    ("combat", "_resolve_combat"),
+    ("alive", "_update_alive_status"),
+    ("movement", "_resolve_movement"),
+    ("init", "init"),
+]
+INIT_PHASES = [
+    ("neighbours", "_query_neighbours"),
+    ("visibility", "_update_visibility"),
+    ("reachability", "_update_reachability"),
+    ("distances", "_update_dist_matrix"),
+    ("obs", "_calculate_obs"),
+    ("avail_movement", "calculate_avail_movements_actions"),
+    ("avail_target", "calculate_avail_target_actions"),
+    ("wiped_teams", "_calculate_wiped_teams"),
+]
+# Phases of the spatial index of the world. (name, method of the index)
+SPATIAL_INDEX_PHASES = [
+    ("spatial_index", "build"),
+    ("spatial_index", "update"),
+]
+
+# Upper bounds of the histogram buckets in nanoseconds: 1us, 2us, 4us, ... ~1s. The last bucket collects the rest.
+HISTOGRAM_BOUNDS = 1000 * 2 ** np.arange(21)
+
+
+class PhaseProfiler(object):
+    def __init__(self, window: int = 1000):
+        """
+        Nanosecond timer of the world phases. Instruments the phase methods of a world instance, which leaves
+        uninstrumented worlds without any overhead.
+        @param window: number of most recent measurements per phase kept for the histograms and percentiles
+        """
+        self.window = window
+        self.counts = {}  # phase -> number of measurements
+        self.totals = {}  # phase -> summed nanoseconds
+        self.recent = {}  # phase -> ring buffer of the most recent measurements
+
+    def instrument(self, world):
+        """
+        Replace the phase methods of the world and its spatial index with timed wrappers.
+        @param world:
+        @return:
+        """
+        for name, method in STEP_PHASES + INIT_PHASES:
+            setattr(world, method, self.timed(name, getattr(world, method)))
+        for name, method in SPATIAL_INDEX_PHASES:
+            setattr(world.spatial_index, method, self.timed(name, getattr(world.spatial_index, method)))
+
+    def timed(self, name: str, method):
+        """
+        @param name: phase name
+        @param method: callable to time
+        @return: wrapper recording the wall time of each call
+        """
+        self.counts.setdefault(name, 0)
+        self.totals.setdefault(name, 0)
+        self.recent.setdefault(name, np.zeros(self.window, dtype=np.int64))
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            result = method(*args, **kwargs)
+            self.record(name, time.perf_counter_ns() - start)
+            return result
+
+        return wrapper
+
+    def record(self, name: str, duration: int):
+        count = self.counts[name]
+        self.recent[name][count % self.window] = duration
+        self.counts[name] = count + 1
+        self.totals[name] += duration
+
+    def stats(self) -> dict:
+        """
+        @return: phase -> count, total and mean nanoseconds and the percentiles and histogram of the recent window
+        """
+        stats = {}
+        for name, count in self.counts.items():
+            if count == 0:
+                continue
+            recent = self.recent[name][:min(count, self.window)]
+            stats[name] = {
+                "count": count,
+                "total_ns": self.totals[name],
+                "mean_ns": self.totals[name] / count,
+                "p50_ns": float(np.percentile(recent, 50)),
+                "p95_ns": float(np.percentile(recent, 95)),
+                "max_ns": int(recent.max()),
+                "histogram": np.bincount(np.searchsorted(HISTOGRAM_BOUNDS, recent),
+                                         minlength=len(HISTOGRAM_BOUNDS) + 1).tolist(),
+            }
+        return stats
+
+    def reset(self):
+        for name in self.counts:
+            self.counts[name] = 0
+            self.totals[name] = 0
@@ -0,0 +1,50 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedArrays(object):
+    def __init__(self, specs: dict):
+        """
+        Numpy arrays placed in one block of shared memory. The object can be passed to worker processes which then
+        access the same arrays without copying.
+        @param specs: name -> (shape, dtype) of each array
+        """
+        self.specs = {name: (tuple(shape), np.dtype(dtype)) for name, (shape, dtype) in specs.items()}
+        size = sum(int(np.prod(shape)) * dtype.itemsize for shape, dtype in self.specs.values())
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self.arrays = self._views()
+        for array in self.arrays.values():
+            array.fill(0)
+
+    def _views(self) -> dict:
+        arrays, offset = {}, 0
+        for name, (shape, dtype) in self.specs.items():
+            arrays[name] = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            offset += int(np.prod(shape)) * dtype.itemsize
+        return arrays
+
+    def __getitem__(self, name) -> np.ndarray:
+        return self.arrays[name]
+
+    def __getstate__(self):
+        return {"specs": self.specs, "shm": self.shm}
+
+    def __setstate__(self, state):  # Attach to the shared memory in a spawned worker process
+        self.specs = state["specs"]
+        self.shm = state["shm"]
+        self.arrays = self._views()
+
+    def close(self, unlink=False):
+        """
+        Release the arrays of this process.
+        @param unlink: free the shared memory. Call once in the creating process.
+        @return:
+        """
+        self.arrays = {}
+        try:
+            self.shm.close()
+        except BufferError:  # Views handed out are still alive. The memory is released with them.
+            pass
+        if unlink:
+            self.shm.unlink()
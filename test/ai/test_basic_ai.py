@@ -25,6 +25,12 @@ class BasicAgentActTestCases(unittest.TestCase):
         result = self.ai.act(self.a, self.world)
         np.testing.assert_array_equal(result.u, [0, 0, self.d.id])
 
+    def test_act_writes_action_in_place(self):
+        u = self.a.action.u
+        result = self.ai.act(self.a, self.world)
+        self.assertIs(result, self.a.action)
+        self.assertIs(result.u, u)
+
     def test_b_should_attack_d(self):
         result = self.ai.act(self.b, self.world)
         np.testing.assert_array_equal(result.u, [0, 0, self.d.id])
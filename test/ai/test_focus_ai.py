@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+from maenv.ai import FocusScriptedAI
+from maenv.core import RoleTypes
+from test.mock import mock_agent, mock_team, mock_world
+
+AGENTS_N = 4
+
+
+class FocusAgentActTestCases(unittest.TestCase):
+    def setUp(self):
+        self.a = mock_agent(id=0, tid=0, sight_range=4)
+        self.b = mock_agent(id=1, tid=1)
+        self.c = mock_agent(id=2, tid=1)
+        self.d = mock_agent(id=3, tid=1)
+        self.at = mock_team(0, members=[self.a])
+        self.bt = mock_team(1, members=[self.b, self.c, self.d])
+        self.world = mock_world(AGENTS_N, teams=[self.at, self.bt])
+        self.world.positions = np.array([[0, 0], [0, 10], [0, 20], [0, 30]], dtype=float)
+        self.world.distances = np.array([[0, 10, 20, 30]] * AGENTS_N, dtype=float)
+        self.world.roles = np.array([int(RoleTypes.TANK), int(RoleTypes.TANK), int(RoleTypes.ADC),
+                                     int(RoleTypes.HEALER)])
+
+    def test_a_should_attack_focused_healer(self):
+        ai = FocusScriptedAI({"focuses": [RoleTypes.HEALER, RoleTypes.ADC, RoleTypes.TANK]})
+        result = ai.act(self.a, self.world)
+        np.testing.assert_array_equal(result.u, [0, 0, self.d.id])
+
+    def test_a_should_attack_second_focus_if_first_focus_missing(self):
+        self.world.roles[3] = int(RoleTypes.TANK)
+        ai = FocusScriptedAI({"focuses": [RoleTypes.HEALER, RoleTypes.ADC, RoleTypes.TANK]})
+        result = ai.act(self.a, self.world)
+        np.testing.assert_array_equal(result.u, [0, 0, self.c.id])
+
+    def test_a_should_attack_closest_if_no_focus_present(self):
+        ai = FocusScriptedAI({"focuses": [RoleTypes.ADC]})
+        self.world.roles[2] = int(RoleTypes.HEALER)
+        result = ai.act(self.a, self.world)
+        np.testing.assert_array_equal(result.u, [0, 0, self.b.id])
+
+    def test_a_should_attack_closest_of_same_focus(self):
+        self.world.roles[1:] = int(RoleTypes.ADC)
+        ai = FocusScriptedAI({"focuses": [RoleTypes.HEALER, RoleTypes.ADC]})
+        result = ai.act(self.a, self.world)
+        np.testing.assert_array_equal(result.u, [0, 0, self.b.id])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import random
+import unittest
+
+import numpy as np
+
+from bin.team_plans_example import AI_VS_AI_SMALL, H2_T2_A1, AI_MEDIUM
+from maenv.core import RoleTypes
+from maenv.scenarios import TeamsScenario
+
+STEPS = 40
+
+
+class ScriptedAIBatchTestCases(unittest.TestCase):
+    def _assert_batch_equals_act(self, plan, ai="basic", ai_config=None):
+        random.seed(0)
+        np.random.seed(0)
+        world = TeamsScenario(plan, random_spawns=True, ai=ai, ai_config=ai_config).make_teams_world()
+        random_moves = 0
+        for _ in range(STEPS):
+            world._calculate_stepable_pos()
+            rng_state = np.random.get_state()
+            previous_actions = world.actions.copy()
+            for agent in world.alive_scripted_agents:
+                world.scripted_ai.act(agent, world)
+            expected = world.actions.copy()
+            expected_rng_state = np.random.get_state()
+
+            np.random.set_state(rng_state)
+            world.actions[:] = previous_actions
+            world.scripted_ai.act_batch(world)
+            np.testing.assert_array_equal(world.actions, expected)
+            np.testing.assert_array_equal(np.random.get_state()[1], expected_rng_state[1])
+            random_moves += np.random.get_state()[2] != rng_state[2]
+
+            # Advance the world with the scripted actions
+            world._resolve_combat()
+            world._update_alive_status()
+            world._resolve_movement()
+            world.init()
+        return random_moves
+
+    def test_basic_batch_equals_act(self):
+        self._assert_batch_equals_act(AI_VS_AI_SMALL)
+
+    def test_basic_batch_with_healers_equals_act(self):
+        self._assert_batch_equals_act(H2_T2_A1)
+
+    def test_basic_batch_with_blocked_moves_equals_act(self):
+        random_moves = self._assert_batch_equals_act(AI_MEDIUM)
+        self.assertGreater(random_moves, 0)
+
+    def test_focus_batch_equals_act(self):
+        config = {"focuses": [RoleTypes.HEALER, RoleTypes.ADC, RoleTypes.TANK]}
+        self._assert_batch_equals_act(H2_T2_A1, ai="focus", ai_config=config)
+
+
+if __name__ == '__main__':
+    unittest.main()
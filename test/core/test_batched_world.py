@@ -0,0 +1,93 @@
+import random
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from bin.team_plans_example import H2_T2_A1_POLICY, SMALL
+from maenv.batched_world import BatchedWorld
+from maenv.core import STATS_FIELDS
+from maenv.scenarios import TeamsScenario
+from test.mock import random_actions
+
+BATCH_SIZE = 3
+STEPS = 60
+
+
+class BatchedWorldTestCases(unittest.TestCase):
+    def _make_worlds(self, plan):
+        random.seed(0)
+        worlds = [TeamsScenario(plan, random_spawns=True).make_teams_world() for _ in range(BATCH_SIZE)]
+        batched = BatchedWorld(worlds[0], BATCH_SIZE, seed=0)
+        for index, world in enumerate(worlds):
+            batched.load(index, world)
+        batched.init()
+        return worlds, batched
+
+    def _assert_equal_worlds(self, worlds, batched):
+        for index, world in enumerate(worlds):
+            np.testing.assert_array_equal(batched.positions[index], world.positions)
+            np.testing.assert_array_equal(batched.health[index], world.health)
+            np.testing.assert_array_equal(batched.alive[index], world.alive)
+            np.testing.assert_allclose(batched.distances[index], world.distances)
+            np.testing.assert_array_equal(batched.visibility[index], world.visibility)
+            np.testing.assert_array_equal(batched.reachability[index], world.reachability)
+            np.testing.assert_allclose(batched.obs[index], world.obs)
+            np.testing.assert_array_equal(batched.avail_movement_actions[index], world.avail_movement_actions)
+            np.testing.assert_array_equal(batched.avail_target_actions[index], world.avail_target_actions)
+            np.testing.assert_array_equal(batched.wiped_teams[index], world.wiped_teams)
+            for agent in world.agents:
+                stats = [getattr(agent.stats, field) for field in STATS_FIELDS]
+                np.testing.assert_array_equal(batched.stats[index, agent.id], stats)
+
+    def _assert_equal_steps(self, plan):
+        worlds, batched = self._make_worlds(plan)
+        self._assert_equal_worlds(worlds, batched)
+        rng = np.random.default_rng(0)
+        sample = random.sample
+        for _ in range(STEPS):
+            actions = np.array([random_actions(world, rng) for world in worlds])
+            combat_ranks = np.zeros(batched.alive.shape)
+            movement_ranks = np.zeros(batched.alive.shape)
+            for index, world in enumerate(worlds):
+                for agent in world.agents:
+                    agent.action.u = actions[index, agent.id].copy()
+                orders = []
+                with patch("random.sample", side_effect=lambda *args: orders.append(sample(*args)) or orders[-1]):
+                    world.step()
+                combat_ranks[index, [agent.id for agent in orders[0]]] = np.arange(len(orders[0]))
+                movement_ranks[index, [agent.id for agent in orders[1]]] = np.arange(len(orders[1]))
+            batched.step(actions, combat_ranks=combat_ranks, movement_ranks=movement_ranks)
+            self._assert_equal_worlds(worlds, batched)
+        return batched
+
+    def test_batch_axis_leads_all_dynamic_data(self):
+        worlds, batched = self._make_worlds(SMALL)
+        n = worlds[0].agents_n
+        self.assertEqual(batched.positions.shape, (BATCH_SIZE, n, 2))
+        self.assertEqual(batched.health.shape, (BATCH_SIZE, n))
+        self.assertEqual(batched.visibility.shape, (BATCH_SIZE, n, n))
+        self.assertEqual(batched.obs.shape, (BATCH_SIZE, n, n, worlds[0].obs_dims))
+
+    def test_step_equals_world_step(self):
+        batched = self._assert_equal_steps(SMALL)
+        self.assertGreater(np.sum(batched.stat("kills")), 0)
+
+    def test_step_with_heals_equals_world_step(self):
+        batched = self._assert_equal_steps(H2_T2_A1_POLICY)
+        self.assertGreater(np.sum(batched.stat("dmg_healed")), 0)
+
+    def test_step_without_ranks_is_reproducible(self):
+        _, batched_a = self._make_worlds(SMALL)
+        _, batched_b = self._make_worlds(SMALL)
+        rng = np.random.default_rng(1)
+        for _ in range(STEPS):
+            actions = np.array([random_actions(batched_a.world, rng)] * BATCH_SIZE)
+            batched_a.step(actions)
+            batched_b.step(actions)
+        np.testing.assert_array_equal(batched_a.positions, batched_b.positions)
+        np.testing.assert_array_equal(batched_a.health, batched_b.health)
+
+
+if __name__ == '__main__':
+    unittest.main()
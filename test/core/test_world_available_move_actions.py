@@ -4,8 +4,6 @@ import numpy as np
 
 from maenv.core import World
 from test.mock import mock_agent
-import scipy.spatial.ckdtree
-import scipy.spatial.distance
 N_AGENTS = 5
 
 
@@ -34,7 +32,7 @@ class WorldAvailableMovementActionsTestCases(unittest.TestCase):
         self.world.connect(self.c, self.c_spawn)
         self.world.connect(self.d, self.d_spawn)
         self.world.connect(self.e, self.e_spawn)
-        self.world.kd_tree = scipy.spatial.cKDTree(data=self.world.positions)
+        self.world.spatial_index.build(self.world.positions)
         self.world._update_alive_status()
         self.world._update_visibility()
         self.world._update_dist_matrix()
@@ -137,5 +135,32 @@ class WorldAvailableMovementActionsTestCases(unittest.TestCase):
         np.testing.assert_array_equal(self.world.avail_movement_actions[self.a.id], [0, 1, 0, 1])
 
 
+class WorldAvailableMovementActionsEquivalenceTestCases(unittest.TestCase):
+    def test_lookup_equals_broadcast_on_crowded_grid(self):
+        rng = np.random.default_rng(0)
+        n_agents = 30
+        for _ in range(20):
+            cells = rng.choice(64, n_agents, replace=False)
+            positions = np.stack((cells % 8, cells // 8), axis=1) * 10.0
+            masks = []
+            for broadcast in [True, False]:
+                world = World(grid_size=10, n_teams=2, n_agents=n_agents, broadcast_movement_mask=broadcast)
+                world.positions = positions.copy()
+                world.calculate_avail_movements_actions()
+                masks.append(world.avail_movement_actions)
+            np.testing.assert_array_equal(masks[0], masks[1])
+
+    def test_lookup_equals_broadcast_with_unplaced_agent(self):
+        positions = np.array([[10.0, 10.0], [20.0, 10.0], [np.nan, np.nan]])  # Agent 2 was connected without spawn
+        masks = []
+        for broadcast in [True, False]:
+            world = World(grid_size=10, n_teams=2, n_agents=len(positions), broadcast_movement_mask=broadcast)
+            world.positions = positions.copy()
+            world.calculate_avail_movements_actions()
+            masks.append(world.avail_movement_actions)
+        np.testing.assert_array_equal(masks[0], masks[1])
+        np.testing.assert_array_equal(masks[1][0], [1, 0, 1, 1])
+
+
 if __name__ == '__main__':
     unittest.main()
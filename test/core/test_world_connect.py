@@ -3,7 +3,7 @@ from unittest.mock import MagicMock
 
 import numpy as np
 
-from maenv.core import World
+from maenv.core import World, Agent, RoleTypes, UnitAttackTypes, STATS_FIELDS
 from test.mock import mock_agent
 
 N_AGENTS = 2
@@ -51,6 +51,7 @@ class WorldInitializationTestCases(unittest.TestCase):
         self.world.connect(self.agent, None)
         np.testing.assert_array_equal(self.world.sight_ranges[0], self.agent.attack_range * self.grid_size)
         np.testing.assert_array_equal(self.world.attack_ranges[0], self.agent.attack_range * self.grid_size)
+        np.testing.assert_array_equal(self.world.scripted_sight_ranges[0], self.agent.sight_range * self.grid_size)
 
     def test_connects_attack_target_mask(self):
         self.world.connect(self.agent, None)
@@ -60,5 +61,62 @@ class WorldInitializationTestCases(unittest.TestCase):
         np.testing.assert_array_equal(self.world.attack_target_mask[1], [True, False])
 
 
+class WorldConnectArrayViewsTestCases(unittest.TestCase):
+    def setUp(self):
+        build_plan = {"role": RoleTypes.TANK, "attack_type": UnitAttackTypes.RANGED}
+        self.agent = Agent(id=1, tid=0, build_plan=build_plan, color=None)
+        self.world = World(grid_size=10, n_teams=2, n_agents=N_AGENTS)
+        self.world.agents = [mock_agent(id=0, tid=1), self.agent]
+        self.world.connect(self.agent, np.array([1, 1]))
+
+    def test_connected_action_is_view_on_world_actions(self):
+        np.testing.assert_array_equal(self.world.actions[1], [0, 0, -1])
+        self.agent.action.u = np.array([10, 0, 0])
+        self.agent.action.u[1] = -10
+        np.testing.assert_array_equal(self.world.actions[1], [10, -10, 0])
+
+    def test_connected_stats_are_view_on_world_stats(self):
+        self.agent.stats.kills += 1
+        self.assertEqual(self.world.stats[1, STATS_FIELDS.index("kills")], 1)
+        self.world.stats[1] = 0
+        self.assertEqual(self.agent.stats.kills, 0)
+
+    def test_connected_health_is_view_on_world_health(self):
+        self.agent.state.health -= 10
+        self.assertEqual(self.world.health[1], self.agent.state.max_health - 10)
+
+
+class WorldResetAgentsTestCases(unittest.TestCase):
+    def _make_world(self):
+        build_plans = [{"role": RoleTypes.HEALER, "attack_type": UnitAttackTypes.RANGED},
+                       {"role": RoleTypes.TANK, "attack_type": UnitAttackTypes.MELEE}]
+        world = World(grid_size=10, n_teams=2, n_agents=4)
+        world.agents = [Agent(id=aid, tid=aid // 2, build_plan=build_plans[aid % 2], color=None) for aid in range(4)]
+        return world
+
+    def test_reset_agents_equals_connect(self):
+        spawns = np.array([[10, 10], [20, 10], [50, 50], [60, 50]])
+        world, expected = self._make_world(), self._make_world()
+        for agent, spawn in zip(expected.agents, spawns):
+            expected.connect(agent, spawn)
+        world.reset_agents(spawns)
+        for name in ["health", "positions", "alive", "sight_ranges", "attack_ranges", "attack_damages", "healers",
+                     "max_health", "unit_bits_obs", "heal_target_mask", "attack_target_mask", "team_affiliations"]:
+            np.testing.assert_array_equal(getattr(world, name), getattr(expected, name), err_msg=name)
+        for agent_id, spawn in enumerate(spawns):
+            self.assertEqual(world.occupancy.occupants(spawn), {agent_id})
+
+    def test_reset_agents_resets_dynamic_data(self):
+        world = self._make_world()
+        world.reset_agents(np.zeros((4, 2)))
+        agent = world.agents[1]
+        agent.state.health -= 10
+        agent.stats.kills += 1
+        world.reset_agents(np.ones((4, 2)) * 10)
+        self.assertEqual(agent.state.health, agent.state.max_health)
+        self.assertEqual(agent.stats.kills, 0)
+        np.testing.assert_array_equal(agent.state.pos, [10, 10])
+
+
 if __name__ == '__main__':
     unittest.main()
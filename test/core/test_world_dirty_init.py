@@ -0,0 +1,68 @@
+import random
+import unittest
+
+import numpy as np
+
+from bin.team_plans_example import SMALL, H2_T2_A1_POLICY
+from maenv.scenarios import TeamsScenario
+from maenv.spatial import REGISTRY
+from test.mock import random_actions
+
+STEPS = 60
+DERIVED = ["distances", "visibility", "reachability", "obs", "avail_movement_actions", "avail_target_actions",
+           "wiped_teams"]
+
+
+class WorldDirtyInitTestCases(unittest.TestCase):
+    def _make_world(self, plan):
+        random.seed(0)
+        np.random.seed(0)
+        return TeamsScenario(plan, random_spawns=True).make_teams_world()
+
+    def _assert_equal_full_init(self, plan):
+        world = self._make_world(plan)
+        rng = np.random.default_rng(0)
+        for _ in range(STEPS):
+            for agent, action in zip(world.agents, random_actions(world, rng)):
+                agent.action.u = action
+            world.step()
+            derived = {name: np.copy(getattr(world, name)) for name in DERIVED}
+            world._rebuild_spatial_index = True  # Forces a full recalculation
+            world.init()
+            for name in DERIVED:
+                np.testing.assert_array_equal(derived[name], getattr(world, name), err_msg=name)
+        return world
+
+    def test_init_equals_full_init(self):
+        self._assert_equal_full_init(SMALL)
+
+    def test_init_with_heals_equals_full_init(self):
+        self._assert_equal_full_init(H2_T2_A1_POLICY)
+
+    def test_static_world_skips_updates(self):
+        world = self._make_world(SMALL)
+        world.skipped_updates = dict.fromkeys(world.skipped_updates, 0)
+        world.init()
+        self.assertEqual(set(world.skipped_updates.values()), {1})
+
+    def test_health_change_updates_observed_health(self):
+        world = self._make_world(SMALL)
+        world.health[0] -= 10
+        world.init()
+        self.assertEqual(world.skipped_updates["obs"], 1)
+        visible = world.visibility[0].astype(bool)
+        np.testing.assert_array_equal(world.obs[0, visible, 1], world.health[0] / world.max_health[0])
+        np.testing.assert_array_equal(world.obs[0, ~visible, 1], 0.0)
+
+    def test_directly_written_positions_update_spatial_index(self):
+        for spatial_index in REGISTRY:
+            with self.subTest(spatial_index=spatial_index):
+                random.seed(0)
+                world = TeamsScenario(SMALL, random_spawns=True, spatial_index=spatial_index).make_teams_world()
+                world.positions[0] = world.positions[-1] + [world.grid_size, 0]  # next to an enemy
+                world.init()
+                derived = {name: np.copy(getattr(world, name)) for name in DERIVED}
+                world._rebuild_spatial_index = True  # Forces a full recalculation
+                world.init()
+                for name in DERIVED:
+                    np.testing.assert_array_equal(derived[name], getattr(world, name), err_msg=name)
@@ -1,9 +1,12 @@
+import random
 import unittest
 
 import numpy as np
 
+from bin.team_plans_example import H2_T2_A1_POLICY
 from maenv.core import World
-from test.mock import mock_agent
+from maenv.scenarios import TeamsScenario
+from test.mock import mock_agent, random_actions
 
 N_AGENTS = 2
 
@@ -27,6 +30,28 @@ class WorldDistancesTestCases(unittest.TestCase):
         np.testing.assert_array_equal(self.world.distances[self.agent.id], [0, np.sqrt(2)])
         np.testing.assert_array_equal(self.world.distances[self.agent2.id], [np.sqrt(2), 0])
 
+    def test_distance_matrix_of_movers(self):
+        self.world._update_dist_matrix()
+        self.world.positions[self.agent.id] = [4, 5]
+        self.world._update_dist_matrix(np.array([self.agent.id]))
+        np.testing.assert_array_equal(self.world.distances, [[0, 5], [5, 0]])
+
+
+class WorldIncrementalDistancesTestCases(unittest.TestCase):
+    def test_incremental_distances_equal_full_distances(self):
+        random.seed(0)
+        np.random.seed(0)
+        world = TeamsScenario(H2_T2_A1_POLICY, random_spawns=True).make_teams_world()
+        world.distance_update_threshold = 1.0  # Never fall back to full recalculations
+        rng = np.random.default_rng(0)
+        for _ in range(30):
+            for agent, action in zip(world.agents, random_actions(world, rng)):
+                agent.action.u = action
+            world.step()
+            full = np.copy(world.distances)
+            world._update_dist_matrix()
+            np.testing.assert_array_equal(world.distances, full)
+
 
 if __name__ == '__main__':
     unittest.main()
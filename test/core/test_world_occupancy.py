@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+
+from maenv.core import World
+from test.mock import mock_agent
+
+N_AGENTS = 2
+
+
+class WorldOccupancyTestCases(unittest.TestCase):
+    def setUp(self):
+        self.agent = mock_agent(id=0)
+        self.agent2 = mock_agent(id=1, tid=1)
+
+        self.world = World(grid_size=10, n_teams=2, n_agents=N_AGENTS)
+        self.world.agents = [self.agent, self.agent2]
+
+        self.world.connect(self.agent, np.array([10, 10]))
+        self.world.connect(self.agent2, np.array([20, 10]))
+        self.world._update_alive_status()
+
+    def test_connected_positions_are_occupied(self):
+        self.assertFalse(self.world.is_free(np.array([10, 10])))
+        self.assertFalse(self.world.is_free(np.array([20, 10])))
+        self.assertTrue(self.world.is_free(np.array([30, 10])))
+
+    def test_reconnect_releases_previous_position(self):
+        self.world.connect(self.agent, np.array([50, 50]))
+        self.assertTrue(self.world.is_free(np.array([10, 10])))
+        self.assertFalse(self.world.is_free(np.array([50, 50])))
+
+    def test_update_pos_moves_occupancy(self):
+        self.agent.action.u[:2] = np.array([0, 10])
+        self.world._update_pos(self.agent)
+        self.assertTrue(self.world.is_free(np.array([10, 10])))
+        self.assertFalse(self.world.is_free(np.array([10, 20])))
+
+    def test_death_releases_position(self):
+        self.world.health[1] = 0
+        self.world._update_alive_status()
+        self.assertTrue(self.world.is_free(np.array([20, 10])))
+        self.assertEqual(len(self.world.occupancy), 1)
+
+    def test_valid_move_on_own_position(self):
+        self.assertTrue(self.world.is_valid_move(self.agent.id))
+
+
+if __name__ == '__main__':
+    unittest.main()
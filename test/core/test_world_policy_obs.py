@@ -0,0 +1,31 @@
+import random
+import unittest
+
+import numpy as np
+
+from bin.team_plans_example import SMALL, H2_T2_A1
+from maenv.scenarios import TeamsScenario
+from test.environment.test_environment_array_api import run
+
+
+class WorldPolicyObsTestCases(unittest.TestCase):
+    def _make_world(self, plan, policy_obs_only):
+        random.seed(0)
+        np.random.seed(0)
+        return TeamsScenario(plan, random_spawns=True, policy_obs_only=policy_obs_only).make_teams_world()
+
+    def test_only_policy_rows_are_observed(self):
+        world = self._make_world(SMALL, policy_obs_only=False)
+        policy_world = self._make_world(SMALL, policy_obs_only=True)
+        policy_ids = [agent.id for agent in policy_world.policy_agents]
+        scripted_ids = [agent.id for agent in policy_world.scripted_agents]
+        np.testing.assert_array_equal(policy_world.obs[policy_ids], world.obs[policy_ids])
+        np.testing.assert_array_equal(policy_world.obs[scripted_ids], 0.0)
+
+    def test_env_observations_equal_full_observations(self):
+        for plan in [SMALL, H2_T2_A1]:
+            expected, actions = run(plan)
+            result, _ = run(plan, actions=actions, policy_obs_only=True)
+            for (obs, reward, done, avail), (obs_p, reward_p, done_p, avail_p) in zip(expected, result):
+                np.testing.assert_array_equal(obs, obs_p)
+                np.testing.assert_array_equal(reward, reward_p)
@@ -0,0 +1,84 @@
+import random
+import unittest
+
+import numpy as np
+
+from bin.team_plans_example import SMALL
+from maenv.environment import TeamsEnv
+from maenv.scenarios import TeamsScenario
+from maenv.utils.profiler import STEP_PHASES, INIT_PHASES, HISTOGRAM_BOUNDS
+from test.mock import random_actions
+
+STEPS = 20
+
+
+def make_world(profile):
+    random.seed(0)
+    np.random.seed(0)
+    return TeamsScenario(SMALL, random_spawns=True, profile=profile).make_teams_world()
+
+
+class WorldProfilerTestCases(unittest.TestCase):
+    def test_disabled_profiler_does_not_instrument(self):
+        world = make_world(profile=False)
+        self.assertIsNone(world.profiler)
+        self.assertEqual(world.profile_stats(), {})
+        for _, method in STEP_PHASES + INIT_PHASES:
+            self.assertNotIn(method, vars(world))
+
+    def test_stats_of_all_phases(self):
+        world = make_world(profile=True)
+        world.profiler.reset()
+        rng = np.random.default_rng(0)
+        for _ in range(STEPS):
+            for agent, action in zip(world.agents, random_actions(world, rng)):
+                agent.action.u = action
+            world.step()
+        stats = world.profile_stats()
+        # Unchanged data is not recalculated
+        expected = {name: STEPS - world.skipped_updates.get(name, 0) for name, _ in STEP_PHASES + INIT_PHASES}
+        # Stepable positions are calculated in step() and for the available movements
+        expected["stepable_pos"] += expected["avail_movement"]
+        for name, count in expected.items():
+            self.assertEqual(stats[name]["count"], count)
+            self.assertEqual(sum(stats[name]["histogram"]), count)
+            self.assertEqual(len(stats[name]["histogram"]), len(HISTOGRAM_BOUNDS) + 1)
+            self.assertLessEqual(stats[name]["p50_ns"], stats[name]["max_ns"])
+        self.assertGreaterEqual(stats["init"]["total_ns"], stats["obs"]["total_ns"])
+        self.assertIn("spatial_index", stats)
+
+    def test_window_limits_recent_measurements(self):
+        world = make_world(profile=True)
+        world.profiler.window = 4
+        world.profiler.recent = {name: np.zeros(4, dtype=np.int64) for name in world.profiler.recent}
+        world.profiler.reset()
+        for _ in range(10):
+            world.step()
+        stats = world.profile_stats()
+        self.assertEqual(stats["combat"]["count"], 10)
+        self.assertEqual(sum(stats["combat"]["histogram"]), 4)
+
+    def test_profiled_step_equals_step(self):
+        world, profiled = make_world(profile=False), make_world(profile=True)
+        random.seed(1)
+        np.random.seed(1)
+        for _ in range(STEPS):
+            world.step()
+        random.seed(1)
+        np.random.seed(1)
+        for _ in range(STEPS):
+            profiled.step()
+        np.testing.assert_array_equal(world.positions, profiled.positions)
+        np.testing.assert_array_equal(world.health, profiled.health)
+
+    def test_env_infos_contain_profile_at_episode_end(self):
+        random.seed(0)
+        np.random.seed(0)
+        env = TeamsEnv(match_build_plan=SMALL, headless=True, random_spawns=True, profile=True)
+        env.reset()
+        env.episode_limit = 2
+        _, _, _, info = env.step([0] * env.n)
+        self.assertNotIn("profile", info)
+        _, _, _, info = env.step([0] * env.n)
+        self.assertIn("combat", info["profile"])
+        env.close()
@@ -0,0 +1,66 @@
+import random
+import unittest
+
+import numpy as np
+
+from bin.team_plans_example import SMALL, H2_T2_A1
+from maenv.environment import TeamsEnv
+from maenv.scenarios import TeamsScenario
+from test.mock import random_actions
+
+K = 2
+STEPS = 30
+
+
+class WorldTopKObsTestCases(unittest.TestCase):
+    def _make_worlds(self, plan, **kwargs):
+        worlds = []
+        for obs_k in [None, K]:
+            random.seed(0)
+            np.random.seed(0)
+            worlds.append(TeamsScenario(plan, random_spawns=True, obs_k=obs_k, **kwargs).make_teams_world())
+        return worlds
+
+    def _assert_top_k_rows(self, world, top_k_world, observers=None):
+        p = world.dim_p
+        for agent in world.agents if observers is None else observers:
+            i = agent.id
+            visible = np.flatnonzero(world.visibility[i].astype(bool) & (np.arange(world.agents_n) != i))
+            nearest = visible[np.lexsort((visible, world.distances[i, visible]))][:K]
+            np.testing.assert_allclose(top_k_world.obs[i, :len(nearest)], world.obs[i, nearest])
+            padding = top_k_world.obs[i, len(nearest):]
+            np.testing.assert_array_equal(padding[..., :3 + p], 0.0)
+            np.testing.assert_array_equal(padding[..., 3 + p:],
+                                          np.broadcast_to(world._unknown_unit_bits, padding[..., 3 + p:].shape))
+
+    def test_obs_shape_independent_of_agent_count(self):
+        _, top_k_world = self._make_worlds(H2_T2_A1)
+        self.assertEqual(top_k_world.obs.shape, (top_k_world.agents_n, K, top_k_world.obs_dims))
+
+    def test_rows_equal_nearest_visible_full_obs(self):
+        world, top_k_world = self._make_worlds(SMALL)
+        rng = np.random.default_rng(0)
+        for _ in range(STEPS):
+            actions = random_actions(world, rng)
+            for w in [world, top_k_world]:
+                for agent, action in zip(w.agents, actions):
+                    agent.action.u = action
+            random.seed(1)
+            world.step()
+            random.seed(1)
+            top_k_world.step()
+            self._assert_top_k_rows(world, top_k_world)
+
+    def test_policy_obs_only(self):
+        world, top_k_world = self._make_worlds(SMALL, policy_obs_only=True)
+        self._assert_top_k_rows(world, top_k_world, observers=top_k_world.policy_agents)
+        scripted_ids = [agent.id for agent in top_k_world.scripted_agents]
+        np.testing.assert_array_equal(top_k_world.obs[scripted_ids], 0.0)
+
+    def test_env_observation_size(self):
+        env = TeamsEnv(match_build_plan=H2_T2_A1, headless=True, random_spawns=True, obs_k=K)
+        obs = env.reset()
+        self_obs_dim = len(env.world.agents[0].self_observation)
+        self.assertEqual(env.observation_space[0].shape, (K * env.world.obs_dims + self_obs_dim,))
+        self.assertEqual(len(obs[0]), env.observation_space[0].shape[0])
+        env.close()
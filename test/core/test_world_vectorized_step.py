@@ -0,0 +1,82 @@
+import random
+import unittest
+from unittest.mock import patch, Mock
+
+import numpy as np
+
+from bin.team_plans_example import SMALL, H2_T2_A1_POLICY
+from maenv.exceptions.agent_exceptions import IllegalTargetError
+from maenv.scenarios import TeamsScenario
+from test.mock import random_actions
+
+STEPS = 60
+
+
+class WorldVectorizedStepTestCases(unittest.TestCase):
+    def _make_world(self, plan, vectorized):
+        random.seed(0)
+        return TeamsScenario(plan, random_spawns=True, vectorized=vectorized, seed=0).make_teams_world()
+
+    def _assert_equal_steps(self, plan):
+        world = self._make_world(plan, vectorized=False)
+        vectorized = self._make_world(plan, vectorized=True)
+        rng = np.random.default_rng(0)
+        sample = random.sample
+        for _ in range(STEPS):
+            actions = random_actions(world, rng)
+            for agent, vectorized_agent in zip(world.agents, vectorized.agents):
+                agent.action.u = actions[agent.id].copy()
+                vectorized_agent.action.u = actions[agent.id].copy()
+            orders = []
+            with patch("random.sample", side_effect=lambda *args: orders.append(sample(*args)) or orders[-1]):
+                world.step()
+            # Replay the processing order of the sequential world
+            ranks = np.zeros((2, world.agents_n), dtype=int)
+            for phase, order in enumerate(orders):
+                ranks[phase, [agent.id for agent in order]] = np.arange(len(order))
+            with patch.object(vectorized, "rng", Mock(permutation=Mock(side_effect=list(ranks)))):
+                vectorized.step()
+
+            np.testing.assert_array_equal(vectorized.health, world.health)
+            np.testing.assert_array_equal(vectorized.stats, world.stats)
+            np.testing.assert_array_equal(vectorized.positions, world.positions)
+            for agent, vectorized_agent in zip(world.agents, vectorized.agents):
+                np.testing.assert_array_equal(vectorized_agent.action.u, agent.action.u)
+            self.assertEqual(vectorized.occupancy._keys, world.occupancy._keys)
+        return vectorized
+
+    def test_vectorized_step_equals_sequential_step(self):
+        world = self._assert_equal_steps(SMALL)
+        self.assertGreater(np.sum(world.stats[:, 0]), 0)  # kills
+
+    def test_vectorized_heals_equal_sequential_heals(self):
+        world = self._assert_equal_steps(H2_T2_A1_POLICY)
+        self.assertGreater(np.sum(world.stats[:, 4]), 0)  # dmg healed
+
+    def test_vectorized_step_reproducible_with_seed(self):
+        worlds = [self._make_world(SMALL, vectorized=True) for _ in range(2)]
+        rng = np.random.default_rng(0)
+        for _ in range(STEPS):
+            actions = random_actions(worlds[0], rng)
+            for world in worlds:
+                for agent in world.agents:
+                    agent.action.u = actions[agent.id].copy()
+            worlds[0].step()
+            worlds[1].step()
+        np.testing.assert_array_equal(worlds[0].positions, worlds[1].positions)
+        np.testing.assert_array_equal(worlds[0].health, worlds[1].health)
+        np.testing.assert_array_equal(worlds[0].stats, worlds[1].stats)
+
+    def test_vectorized_attack_of_team_mate_raises(self):
+        world = self._make_world(SMALL, vectorized=True)
+        attacker = next(agent for agent in world.agents if not agent.has_heal())
+        mate = next(agent for agent in world.agents if agent.tid == attacker.tid and agent is not attacker)
+        for agent in world.agents:
+            agent.action.u = np.array([0.0, 0.0, -1.0])
+        attacker.action.u[2] = mate.id
+        with self.assertRaises(IllegalTargetError):
+            world.step()
+
+
+if __name__ == '__main__':
+    unittest.main()
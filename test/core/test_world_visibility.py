@@ -2,7 +2,6 @@ import unittest
 from unittest.mock import MagicMock
 
 import numpy as np
-import scipy.spatial.ckdtree
 import scipy.spatial.distance
 
 from maenv.core import World
@@ -24,7 +23,7 @@ class WorldVisibilityTestCases(unittest.TestCase):
         self.world.positions = np.array([[10, 10], [10, 0]])
         self.world.sight_ranges = np.array([attack_range_a * self.grid_size, attack_range_b * self.grid_size])
         self.world.alive = np.array([1, 1])
-        self.world.kd_tree = scipy.spatial.cKDTree(data=self.world.positions)
+        self.world.spatial_index.build(self.world.positions)
 
     def test_a_can_see_b(self):
         self.world._update_visibility()
@@ -32,7 +31,7 @@ class WorldVisibilityTestCases(unittest.TestCase):
 
     def test_a_can_not_see_b_because_out_of_range(self):
         self.world.positions[self.bid] = [100, 0]  # move b out of range
-        self.world.kd_tree = scipy.spatial.cKDTree(data=self.world.positions)
+        self.world.spatial_index.build(self.world.positions)
         self.world._update_visibility()
         np.testing.assert_array_equal([1, 0], self.world.visibility[self.aid])
 
@@ -48,5 +47,26 @@ class WorldVisibilityTestCases(unittest.TestCase):
         np.testing.assert_array_equal([1, 0], self.world.visibility[self.aid])
 
 
+class WorldNeighbourhoodTestCases(unittest.TestCase):
+    def test_fused_query_equals_separate_range_queries(self):
+        rng = np.random.default_rng(0)
+        n_agents = 20
+        world = World(grid_size=10, n_teams=2, n_agents=n_agents)
+        for _ in range(10):
+            world.positions = rng.integers(0, 10, (n_agents, 2)) * 10.0
+            world.sight_ranges = rng.choice([20.0, 40.0], n_agents)
+            world.attack_ranges = world.sight_ranges - 10.0
+            world.alive = rng.random(n_agents) < 0.8
+            world.spatial_index.build(world.positions)
+            neighbours = world._query_neighbours()
+            world._update_visibility(neighbours)
+            world._update_reachability(neighbours)
+
+            distances = scipy.spatial.distance.cdist(world.positions, world.positions)
+            alive = world.alive[:, np.newaxis] & world.alive[np.newaxis, :]
+            np.testing.assert_array_equal(world.visibility, (distances <= world.sight_ranges[:, np.newaxis]) & alive)
+            np.testing.assert_array_equal(world.reachability, (distances <= world.attack_ranges[:, np.newaxis]) & alive)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,65 @@
+import random
+import unittest
+
+import numpy as np
+
+from bin.team_plans_example import SMALL, H2_T2_A1_POLICY
+from maenv.environment import TeamsEnv
+
+STEPS = 60
+
+
+def run(plan, actions=None, **kwargs):
+    """
+    Run a seeded episode. Random available actions are drawn if no actions are provided.
+    """
+    random.seed(0)
+    np.random.seed(0)
+    env = TeamsEnv(match_build_plan=plan, grid_size=10, headless=True, random_spawns=True, **kwargs)
+    env.reset()
+    rng = np.random.default_rng(0)
+    transitions, taken = [], []
+    for t in range(STEPS):
+        avail = np.array(env.get_avail_actions(), dtype=bool)
+        if actions is None:
+            action_n = [rng.choice(np.flatnonzero(mask)) for mask in avail]
+        else:
+            action_n = actions[t]
+        obs, reward, done, info = env.step(action_n)
+        transitions.append((np.array(obs), np.array(reward, dtype=float), np.array(done, dtype=bool), avail))
+        taken.append(action_n)
+        if np.any(done):
+            env.reset()
+    return transitions, taken
+
+
+class EnvironmentArrayApiTestCases(unittest.TestCase):
+    def _assert_equal_episodes(self, plan, global_reward):
+        expected, actions = run(plan, global_reward=global_reward)
+        result, _ = run(plan, actions=actions, global_reward=global_reward, array_api=True)
+        for (obs, reward, done, avail), (obs_a, reward_a, done_a, avail_a) in zip(expected, result):
+            np.testing.assert_array_equal(obs, obs_a)
+            np.testing.assert_allclose(reward, reward_a)
+            np.testing.assert_array_equal(done, done_a)
+            np.testing.assert_array_equal(avail, avail_a)
+        self.assertTrue(np.any([np.any(reward != 0) for _, reward, _, _ in expected]))
+
+    def test_step_equals_list_api_with_global_reward(self):
+        self._assert_equal_episodes(SMALL, global_reward=True)
+
+    def test_step_equals_list_api_with_local_reward(self):
+        self._assert_equal_episodes(H2_T2_A1_POLICY, global_reward=False)
+
+    def test_step_returns_arrays(self):
+        env = TeamsEnv(match_build_plan=SMALL, grid_size=10, headless=True, array_api=True)
+        obs = env.reset()
+        action_n = [0] * env.n
+        obs, reward, done, info = env.step(action_n)
+        self.assertEqual(obs.shape, (env.n, env.observation_space[0].shape[0]))
+        self.assertEqual(done.dtype, bool)
+        self.assertEqual(info["avail_actions"].shape, (env.n, env.action_space[0].n))
+        self.assertEqual(info["avail_actions"].dtype, bool)
+
+
+if __name__ == '__main__':
+    unittest.main()
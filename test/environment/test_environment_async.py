@@ -0,0 +1,106 @@
+import asyncio
+import random
+import sys
+import unittest
+
+import numpy as np
+
+from bin.team_plans_example import SMALL
+from maenv.environment import TeamsEnv, BatchMultiAgentEnv, SubprocBatchMultiAgentEnv
+from maenv.exceptions.environment_exceptions import AsyncStepError
+
+N_ENVS = 2
+STEPS = 20
+ENV_KWARGS = dict(match_build_plan=SMALL, grid_size=10, headless=True, random_spawns=True)
+
+
+def make_batch(**kwargs):
+    random.seed(0)
+    np.random.seed(0)
+    batch = BatchMultiAgentEnv([TeamsEnv(**ENV_KWARGS) for _ in range(N_ENVS)], **kwargs)
+    batch.reset()
+    return batch
+
+
+def idle_actions(batch):
+    return [0] * batch.n  # no-op
+
+
+class BatchMultiAgentEnvAsyncTestCases(unittest.TestCase):
+    def test_step_wait_equals_step(self):
+        # A single worker steps the environments in order - equal draws from the global random state
+        expected_batch, batch = make_batch(), make_batch()
+        random.seed(1)
+        np.random.seed(1)
+        expected = [expected_batch.step(idle_actions(expected_batch)) for _ in range(STEPS)]
+        random.seed(1)
+        np.random.seed(1)
+        for expected_result in expected:
+            batch.step_async(idle_actions(batch))
+            result = batch.step_wait()
+            for expected_values, values in zip(expected_result[:3], result[:3]):
+                np.testing.assert_array_equal(expected_values, values)
+        expected_batch.close()
+        batch.close()
+
+    def test_step_wait_is_reproducible(self):
+        results = []
+        for _ in range(2):
+            batch = make_batch()
+            random.seed(1)
+            np.random.seed(1)
+            run = []
+            for _ in range(STEPS):
+                batch.step_async(idle_actions(batch))
+                run.append(batch.step_wait()[:3])
+            results.append(run)
+            batch.close()
+        for expected_result, result in zip(*results):
+            for expected_values, values in zip(expected_result, result):
+                np.testing.assert_array_equal(expected_values, values)
+
+    def test_astep(self):
+        batch = make_batch()
+        obs_n, reward_n, done_n, _ = asyncio.run(batch.astep(idle_actions(batch)))
+        self.assertEqual(len(obs_n), batch.n)
+        self.assertEqual(len(done_n), 2 * N_ENVS)
+        batch.close()
+
+    def test_step_async_twice_raises(self):
+        batch = make_batch()
+        batch.step_async(idle_actions(batch))
+        with self.assertRaises(AsyncStepError):
+            batch.step_async(idle_actions(batch))
+        batch.step_wait()
+        with self.assertRaises(AsyncStepError):
+            batch.step_wait()
+        batch.close()
+
+
+@unittest.skipIf(sys.version_info < (3, 8), "multiprocessing.shared_memory requires Python 3.8")
+class SubprocBatchMultiAgentEnvAsyncTestCases(unittest.TestCase):
+    def setUp(self):
+        kwargs = dict(ENV_KWARGS)
+        kwargs.pop("headless")
+        self.env = SubprocBatchMultiAgentEnv(N_ENVS, seed=0, **kwargs)
+        self.env.reset()
+
+    def tearDown(self):
+        self.env.close()
+
+    def test_astep(self):
+        obs, rewards, dones, info = asyncio.run(self.env.astep(np.zeros((N_ENVS, self.env.n), dtype=int)))
+        self.assertEqual(obs.shape[:2], (N_ENVS, self.env.n))
+        self.assertFalse(self.env.waiting)
+
+    def test_reset_while_waiting_raises(self):
+        self.env.step_async(np.zeros((N_ENVS, self.env.n), dtype=int))
+        with self.assertRaises(AsyncStepError):
+            self.env.reset()
+        self.env.step_wait()
+
+    def test_close_while_waiting(self):
+        self.env.step_async(np.zeros((N_ENVS, self.env.n), dtype=int))
+        self.env.close()
+        for process in self.env.processes:
+            self.assertFalse(process.is_alive())
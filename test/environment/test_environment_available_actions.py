@@ -66,3 +66,14 @@ class EnvironmentAvailableActionTestCases(unittest.TestCase):
             [1., 1., 0., 0., 0., 0., 0., 1., 1.],  # Agent A
             [1., 0., 1., 0., 0., 1., 0., 0., 0.]  # Agent B
         ])
+
+    def test_get_avail_actions_array_equals_per_agent_actions(self):
+        avail_actions = self.env.get_avail_actions_array()
+        self.assertEqual(avail_actions.dtype, bool)
+        np.testing.assert_array_equal(avail_actions, [
+            self.env.get_available_actions(self.a),
+            self.env.get_available_actions(self.b),
+        ])
+
+    def test_get_avail_actions_array_reuses_buffer(self):
+        self.assertIs(self.env.get_avail_actions_array(), self.env.get_avail_actions_array())
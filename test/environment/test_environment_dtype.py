@@ -0,0 +1,31 @@
+import unittest
+
+import numpy as np
+
+from bin.team_plans_example import SMALL
+from test.environment.test_environment_array_api import run
+from maenv.environment import TeamsEnv
+
+
+class EnvironmentDtypeTestCases(unittest.TestCase):
+    def test_float32_buffers(self):
+        env = TeamsEnv(match_build_plan=SMALL, headless=True, random_spawns=True, dtype=np.float32)
+        obs = env.reset()
+        world = env.world
+        for array in [world.health, world.positions, world.distances, world.obs, obs[0], env.get_state(),
+                      env.get_avail_actions()[0]]:
+            self.assertEqual(array.dtype, np.float32)
+        self.assertEqual(env.observation_space[0].dtype, np.float32)
+        self.assertEqual(world.visibility.dtype, bool)
+        self.assertEqual(world.reachability.dtype, bool)
+        env.close()
+
+    def test_float32_episode_close_to_float64(self):
+        expected, actions = run(SMALL)
+        result, _ = run(SMALL, actions=actions, dtype=np.float32, array_api=True)
+        for (obs, reward, done, avail), (obs_32, reward_32, done_32, avail_32) in zip(expected, result):
+            self.assertEqual(obs_32.dtype, np.float32)
+            np.testing.assert_allclose(obs, obs_32, atol=1e-6)
+            np.testing.assert_allclose(reward, reward_32, atol=1e-5)
+            np.testing.assert_array_equal(done, done_32)
+            np.testing.assert_array_equal(avail, avail_32)
@@ -32,4 +32,16 @@ class EnvironmentObservationsTestCases(unittest.TestCase):
     def test_get_obs(self):
         obs = self.env.get_obs()
         obs = np.array(obs)
-        self.assertEqual(obs.shape, (self.policy_agents, self.obs_n))
\ No newline at end of file
+        self.assertEqual(obs.shape, (self.policy_agents, self.obs_n))
+
+    def test_get_obs_returns_views_on_persistent_buffer(self):
+        obs = self.env.get_obs()
+        for row in obs:
+            self.assertTrue(np.shares_memory(row, self.env._obs_n))
+
+    def test_observations_callback_writes_buffer(self):
+        def observations(world, out):
+            out[...] = 1.0
+        env = MAEnv(self.world, headless=True, observation_callback=lambda x, y: list(range(self.obs_n)),
+                    observations_callback=observations)
+        np.testing.assert_array_equal(env.reset(), np.ones((self.policy_agents, self.obs_n)))
@@ -3,7 +3,8 @@ import unittest
 import numpy as np
 
 from maenv.environment import MAEnv
-from test.mock import mock_world, mock_agent
+from maenv.exceptions.environment_exceptions import InvalidActionId
+from test.mock import mock_world, mock_agent, mock_team
 
 
 class EnvironmentSetActionTestCases(unittest.TestCase):
@@ -42,3 +43,17 @@ class EnvironmentSetActionTestCases(unittest.TestCase):
         self.env._set_action(8, self.a)
         self.assertIsNotNone(self.a.action)
         np.testing.assert_array_equal(self.a.action.u, [0, 0, 3])
+
+    def test_action_table_equals_set_action(self):
+        table = self.env._build_action_table(9)  # 4 movements and 4 targets
+        for action in range(len(table)):
+            self.env._set_action(action, self.a)
+            np.testing.assert_array_equal(table[action], self.a.action.u)
+
+    def test_step_raises_on_invalid_action_ids(self):
+        world = mock_world(teams=[mock_team(tid=0, members=[self.a])])
+        env = MAEnv(world, headless=True, observation_callback=lambda agent, world: [0.0])
+        for action in [-1, len(env._action_table)]:
+            with self.assertRaises(InvalidActionId):
+                env.step([action])
+        world.step.assert_not_called()
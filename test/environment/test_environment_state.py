@@ -25,6 +25,14 @@ class EnvironmentStateTestCases(unittest.TestCase):
         np.testing.assert_array_equal(result, [-0.5, -0.5, 1., 0., 0., 1., -0.5, -0.5, 1., 0., 0., 1.])
 
     def test_get_state_returns_b_in_center_relative_to_world_center(self):
-        self.b.state.pos = self.world.center # Place in B in map center
+        self.world.positions[1] = self.world.center  # Place in B in map center
+        self.world.tick += 1
         result = self.env.get_state()
         np.testing.assert_array_equal(result, [-0.5, -0.5, 1., 0., 0., 1., 0., 0., 1., 0., 0., 1.])
+
+    def test_get_state_is_cached_until_world_tick_changes(self):
+        state = self.env.get_state().copy()
+        self.world.positions[1] = self.world.center
+        np.testing.assert_array_equal(self.env.get_state(), state)
+        self.world.tick += 1
+        np.testing.assert_array_equal(self.env.get_state()[6:8], [0., 0.])
@@ -0,0 +1,71 @@
+import random
+import sys
+import unittest
+
+import numpy as np
+
+from bin.team_plans_example import SMALL
+from maenv.environment import TeamsEnv, SubprocBatchMultiAgentEnv
+from maenv.exceptions.environment_exceptions import EnvironmentWorkerError
+
+N_ENVS = 2
+SEED = 3
+STEPS = 40
+ENV_KWARGS = dict(match_build_plan=SMALL, grid_size=10, random_spawns=True)
+
+
+@unittest.skipIf(sys.version_info < (3, 8), "multiprocessing.shared_memory requires Python 3.8")
+class SubprocBatchMultiAgentEnvTestCases(unittest.TestCase):
+    def setUp(self):
+        self.env = SubprocBatchMultiAgentEnv(N_ENVS, seed=SEED, **ENV_KWARGS)
+
+    def tearDown(self):
+        self.env.close()
+
+    def _make_single_env(self, index):
+        random.seed(SEED + index)
+        np.random.seed(SEED + index)
+        return TeamsEnv(**ENV_KWARGS, headless=True, array_api=True, seed=SEED + index)
+
+    def test_shapes(self):
+        obs = self.env.reset()
+        n = self.env.n
+        self.assertEqual(obs.shape, (N_ENVS, n, self.env.observation_space[0].shape[0]))
+        self.assertEqual(self.env.get_avail_actions().shape, (N_ENVS, n, self.env.action_space[0].n))
+        _, rewards, dones, info = self.env.step(np.zeros((N_ENVS, n), dtype=int))
+        self.assertEqual(rewards.shape[0], N_ENVS)
+        self.assertEqual(dones.shape, (N_ENVS, 2))
+        self.assertEqual(info["avail_actions"].shape[0], N_ENVS)
+
+    def test_steps_equal_single_process_envs(self):
+        rng = np.random.default_rng(0)
+        transitions = [(self.env.reset().copy(), None, None, self.env.get_avail_actions().copy())]
+        for _ in range(STEPS):
+            avail = self.env.get_avail_actions()
+            actions = np.array([[rng.choice(np.flatnonzero(mask)) for mask in masks] for masks in avail])
+            obs, rewards, dones, info = self.env.step(actions)
+            transitions.append((obs.copy(), rewards.copy(), dones.copy(), info["avail_actions"].copy(), actions))
+        # Replay each environment on its own since they share the global random state within a process
+        for index in range(N_ENVS):
+            single = self._make_single_env(index)
+            np.testing.assert_array_equal(transitions[0][0][index], single.reset())
+            for obs, rewards, dones, avail, actions in transitions[1:]:
+                obs_s, rewards_s, dones_s, _ = single.step(actions[index])
+                np.testing.assert_array_equal(rewards[index], rewards_s)
+                np.testing.assert_array_equal(dones[index], dones_s)
+                if np.any(dones_s):  # Finished episodes are reset automatically
+                    obs_s = single.reset()
+                np.testing.assert_array_equal(obs[index], obs_s)
+                np.testing.assert_array_equal(avail[index], single.get_avail_actions())
+            single.close()
+
+    def test_worker_error_is_raised(self):
+        self.env.reset()
+        actions = np.full((N_ENVS, self.env.n), self.env.action_space[0].n + 1)
+        with self.assertRaises(EnvironmentWorkerError):
+            self.env.step(actions)
+
+    def test_close_stops_workers(self):
+        self.env.close()
+        for process in self.env.processes:
+            self.assertFalse(process.is_alive())
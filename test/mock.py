@@ -3,6 +3,8 @@ from unittest.mock import MagicMock, Mock
 
 import numpy as np
 
+from maenv.core import RoleTypes
+
 
 def mock_agent(id: int, tid: int = 0, sight_range=2, attack_range=1, pos=np.array([0, 0])):
     agent = Mock()
@@ -15,8 +17,10 @@ def mock_agent(id: int, tid: int = 0, sight_range=2, attack_range=1, pos=np.arra
     agent.is_alive = MagicMock(return_value=True)
     agent.sight_range = sight_range
     agent.attack_range = attack_range
+    agent.attack_damage = 10
     agent.has_heal = MagicMock(return_value=False)
-    agent.action.u = np.zeros((2,))
+    agent.role_type = RoleTypes.TANK
+    agent.action.u = np.array([0.0, 0.0, -1.0])
     agent.unit_type_bits = [0, 0, 1]
     agent.state.pos = pos
     agent.self_observation = [agent.state.health() / agent.state.max_health] + agent.unit_type_bits
@@ -49,6 +53,14 @@ def mock_world(agents_n=None, grid_size=10, teams=None, obs_dims_per_agent=8, te
     world.scripted_teams = [] if len(teams) < 2 else [teams[1]]
     world.policy_agents = [] if len(teams) == 0 else teams[0].members
     world.dim_p = 2
+    world.dtype = np.dtype(np.float64)
+    world.tick = 0
+    world.positions = np.array([agent.state.pos for agent in world.agents], dtype=float).reshape(-1, world.dim_p)
+    world.health = np.array([agent.state.health() for agent in world.agents], dtype=float)
+    world.max_health = np.array([agent.state.max_health for agent in world.agents], dtype=float)
+    world.unit_bits_obs = np.array([agent.unit_type_bits for agent in world.agents], dtype=float)
+    world.actions = np.zeros((agents_n, world.dim_p + 1))
+    world.actions[:, 2] = -1
     world.connect = MagicMock()
     world.obs = np.zeros((agents_n, agents_n, int(obs_dims_per_agent * agents_n / 2)))
     world.obs[0, :] = 1.0
@@ -66,3 +78,20 @@ def mock_ai():
     ai = Mock()
     ai.act = MagicMock()
     return ai
+
+
+def random_actions(world, rng):
+    """
+    Random legal physical actions (movement in world units and target id) for all agents of a world.
+    """
+    actions = np.zeros((world.agents_n, world.dim_p + 1))
+    actions[:, 2] = -1
+    for agent in world.agents:
+        moves = np.flatnonzero(world.avail_movement_actions[agent.id])
+        targets = np.flatnonzero(world.avail_target_actions[agent.id])
+        choice = rng.integers(len(moves) + len(targets) + 1)
+        if choice < len(moves):
+            actions[agent.id, :2] = world.moves[moves[choice]]
+        elif choice < len(moves) + len(targets):
+            actions[agent.id, 2] = targets[choice - len(moves)]
+    return actions
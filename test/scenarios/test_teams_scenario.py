@@ -2,7 +2,7 @@ import unittest
 
 import numpy as np
 
-from bin.team_plans_example import SMALL_1x1, AI_SMALL_1x1
+from bin.team_plans_example import SMALL_1x1, AI_SMALL_1x1, SMALL
 from maenv.scenarios import TeamsScenario
 from test.mock import mock_world, mock_team, mock_spawn_generator, mock_agent, mock_ai
 
@@ -85,13 +85,16 @@ class TeamsScenarioResetTestCases(unittest.TestCase):
         self.assertEqual(len(self.scenario.team_spawns), 2)
         self.assertEqual(len(self.scenario.agent_spawns), 2)
 
-    def test_reset_world_calls_connect_agents(self):
+    def test_reset_world_resets_agents(self):
         self.scenario.reset_world(self.world)
-        self.assertEqual(self.world.connect.call_count, 2)
-        result_arg_0 = self.world.connect.call_args[0][0]
-        result_arg_1 = self.world.connect.call_args[0][1]
-        self.assertEqual(self.d, result_arg_0)
-        np.testing.assert_array_equal(np.array([0, 0]), result_arg_1)
+        self.assertEqual(self.world.reset_agents.call_count, 1)
+        result_arg_0 = self.world.reset_agents.call_args[0][0]
+        np.testing.assert_array_equal(np.array([[0, 0], [0, 0]]), result_arg_0)
+
+    def test_reset_world_reuses_spawns(self):
+        self.scenario.reset_world(self.world)
+        self.scenario.reset_world(self.world)
+        self.assertIs(self.world.reset_agents.call_args_list[0][0][0], self.world.reset_agents.call_args_list[1][0][0])
 
 
 class TeamsScenarioObservationTestCases(unittest.TestCase):
@@ -107,3 +110,17 @@ class TeamsScenarioObservationTestCases(unittest.TestCase):
         result = self.scenario.observation(self.c, self.world)
         self.assertEqual(result.shape, (20,))
         np.testing.assert_array_equal(result, ([1] * 16) + self.c.self_observation)
+
+
+class TeamsScenarioBatchedObservationTestCases(unittest.TestCase):
+    def setUp(self):
+        self.scenario = TeamsScenario(SMALL, random_spawns=True)
+        self.world = self.scenario.make_teams_world()
+        self.world.health[0] = 1.0
+
+    def test_observations_equal_observation_per_agent(self):
+        policy_agents = self.world.policy_agents
+        out = np.zeros((len(policy_agents), len(self.scenario.observation(policy_agents[0], self.world))))
+        self.scenario.observations(self.world, out)
+        for row, agent in enumerate(policy_agents):
+            np.testing.assert_array_equal(out[row], self.scenario.observation(agent, self.world))
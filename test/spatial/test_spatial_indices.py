@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+
+from bin.team_plans_example import SMALL
+from maenv.scenarios import TeamsScenario
+from maenv.spatial import REGISTRY, BruteForceSpatialIndex, GridSpatialIndex
+
+RADIUS = 30.0
+
+
+def as_set(pairs):
+    return {(i, j, round(v, 9)) for i, j, v in pairs.tolist()}
+
+
+class SpatialIndexTestCases(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.positions = self.rng.integers(0, 20, size=(50, 2)).astype(float) * 10
+
+    def _assert_equal_to_brute_force(self, index, positions):
+        expected = BruteForceSpatialIndex()
+        expected.build(positions)
+        self.assertEqual(as_set(expected.query_pairs(RADIUS)), as_set(index.query_pairs(RADIUS)))
+
+    def test_backends_find_same_pairs(self):
+        for name, backend in REGISTRY.items():
+            with self.subTest(backend=name):
+                index = backend()
+                index.build(self.positions)
+                self._assert_equal_to_brute_force(index, self.positions)
+
+    def test_backends_find_same_pairs_after_updates(self):
+        moves = np.array([[0, 10], [0, -10], [10, 0], [-10, 0]])
+        for name, backend in REGISTRY.items():
+            with self.subTest(backend=name):
+                positions = self.positions.copy()
+                index = backend()
+                index.build(positions)
+                index.query_pairs(RADIUS)
+                for _ in range(20):
+                    moved = np.flatnonzero(self.rng.random(len(positions)) < 0.2)
+                    positions[moved] += moves[self.rng.integers(len(moves), size=len(moved))]
+                    index.update(positions, moved)
+                    self._assert_equal_to_brute_force(index, positions)
+
+    def test_pairs_include_self(self):
+        for name, backend in REGISTRY.items():
+            with self.subTest(backend=name):
+                index = backend()
+                index.build(self.positions)
+                pairs = index.query_pairs(RADIUS)
+                self_pairs = pairs[pairs['i'] == pairs['j']]
+                np.testing.assert_array_equal(np.sort(self_pairs['i']), np.arange(len(self.positions)))
+
+    def test_grid_ignores_agents_without_position(self):
+        positions = self.positions.copy()
+        positions[0] = np.nan
+        index = GridSpatialIndex(cell_size=RADIUS)
+        index.build(positions)
+        pairs = index.query_pairs(RADIUS)
+        self.assertFalse(np.any((pairs['i'] == 0) | (pairs['j'] == 0)))
+
+    def test_world_visibility_equal_for_all_backends(self):
+        worlds = {}
+        for name in REGISTRY.keys():
+            np.random.seed(0)
+            worlds[name] = TeamsScenario(SMALL, spatial_index=name).make_teams_world()
+        expected = worlds.pop("brute_force")
+        for name, world in worlds.items():
+            with self.subTest(backend=name):
+                np.testing.assert_array_equal(expected.visibility, world.visibility)
+                np.testing.assert_array_equal(expected.reachability, world.reachability)
+
+
+if __name__ == '__main__':
+    unittest.main()
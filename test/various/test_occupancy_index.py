@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+
+from maenv.utils.occupancy_index import OccupancyIndex
+
+
+class OccupancyIndexTestCases(unittest.TestCase):
+    def setUp(self):
+        self.index = OccupancyIndex()
+        self.index.add(0, np.array([10, 20]))
+        self.index.add(1, np.array([20, 20]))
+
+    def test_occupants_of_occupied_position(self):
+        self.assertEqual(self.index.occupants(np.array([10., 20.])), {0})
+
+    def test_no_occupants_of_free_position(self):
+        self.assertEqual(len(self.index.occupants(np.array([30, 20]))), 0)
+
+    def test_add_releases_previous_position(self):
+        self.index.add(0, np.array([30, 20]))
+        self.assertEqual(len(self.index.occupants(np.array([10, 20]))), 0)
+        self.assertEqual(self.index.occupants(np.array([30, 20])), {0})
+
+    def test_multiple_occupants(self):
+        self.index.add(2, np.array([10, 20]))
+        self.assertEqual(self.index.occupants(np.array([10, 20])), {0, 2})
+
+    def test_remove(self):
+        self.index.remove(1)
+        self.assertEqual(len(self.index.occupants(np.array([20, 20]))), 0)
+        self.assertEqual(len(self.index), 1)
+
+    def test_remove_unknown_agent(self):
+        self.index.remove(5)
+        self.assertEqual(len(self.index), 2)
+
+    def test_clear(self):
+        self.index.clear()
+        self.assertEqual(len(self.index), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()